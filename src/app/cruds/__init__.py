@@ -1,7 +1,13 @@
 from cruds.admin import AdminCrud
 from cruds.post import PostCrud
+from cruds.public_read import PublicReadCrud
+from cruds.revoked_token import RevokedTokenCrud
+from cruds.search import SearchCrud
 from cruds.tag import TagCrud
 
 admin_crud = AdminCrud()
 post_crud = PostCrud()
+public_read_crud = PublicReadCrud()
+revoked_token_crud = RevokedTokenCrud()
+search_crud = SearchCrud()
 tag_crud = TagCrud()
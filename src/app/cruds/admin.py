@@ -1,30 +1,30 @@
+from typing import Optional
 from uuid import UUID
-import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Admin
+from models import Admin, Post
 from schemas import admin_schema
 from .domain import UpdateProcess
-from services import auth_service
+from services import auth_service, principal_cache
 from utils.logger import setup_logger
-from .domain.logging_utils import NoPasswordLogFilter
 
 
-log_folder = f"log/{datetime.date.today()}.log"
-logger = setup_logger(log_folder=log_folder, log_filter=NoPasswordLogFilter(), modname=__name__)
+logger = setup_logger(modname=__name__)
 
 
 class AdminCrud:
 
-    def get_admin_by_id(self, admin_id: UUID, db: Session) -> Admin:
+    async def get_admin_by_id(self, admin_id: UUID, db: AsyncSession) -> Admin:
         logger.info({
             "action": "get admin model by id",
             "admin_id": admin_id,
             "status": "run"
         })
 
-        db_admin = db.query(Admin).filter(Admin.id == admin_id).first()
+        result = await db.execute(select(Admin).where(Admin.id == admin_id))
+        db_admin = result.scalars().first()
 
         logger.info({
             "action": "get admin model by id",
@@ -33,13 +33,33 @@ class AdminCrud:
 
         return db_admin
 
-    def get_admin_by_email(self, email: str, db: Session) -> Admin:
+    async def get_principal(self, admin_id: UUID, db: AsyncSession) -> Optional[admin_schema.AdminInDB]:
+        # Authenticated requests resolve the admin from a short-lived snapshot instead of a query per request
+        try:
+            admin_id = UUID(str(admin_id))
+        except ValueError:
+            return None
+
+        principal = principal_cache.get(admin_id)
+        if principal is not None:
+            return principal
+
+        db_admin = await self.get_admin_by_id(admin_id, db)
+        if not db_admin:
+            return None
+
+        principal = admin_schema.AdminInDB.from_orm(db_admin)
+        principal_cache.set(admin_id, principal)
+        return principal
+
+    async def get_admin_by_email(self, email: str, db: AsyncSession) -> Admin:
         logger.info({
             "action": "get admin model by email",
             "status": "run"
         })
 
-        db_admin = db.query(Admin).filter(Admin.email == email).first()
+        result = await db.execute(select(Admin).where(Admin.email == email))
+        db_admin = result.scalars().first()
 
         logger.info({
             "action": "get admin model by email",
@@ -48,13 +68,13 @@ class AdminCrud:
 
         return db_admin
 
-    def create_admin(self, new_admin: admin_schema.AdminCreate, db: Session) -> Admin:
+    async def create_admin(self, new_admin: admin_schema.AdminCreate, db: AsyncSession) -> Admin:
         logger.info({
             "action": "insert new admin to db",
             "status": "run"
         })
 
-        hashed_password = auth_service.get_password_hash(new_admin.password)
+        hashed_password = await auth_service.get_password_hash(new_admin.password)
 
         try:
             db_admin = Admin(
@@ -62,11 +82,11 @@ class AdminCrud:
                 hashed_password=hashed_password,
             )
             db.add(db_admin)
-            db.commit()
-            db.refresh(db_admin)
+            await db.commit()
+            await db.refresh(db_admin)
         except Exception as e:
             logger.error("Failed create admin user")
-            db.rollback()
+            await db.rollback()
             raise e
 
         logger.info({
@@ -76,7 +96,7 @@ class AdminCrud:
 
         return db_admin
 
-    def update_admin(self, current_admin: Admin, new_admin: admin_schema.AdminUpdate, db: Session) -> Admin:
+    async def update_admin(self, current_admin: Admin, new_admin: admin_schema.AdminUpdate, db: AsyncSession) -> Admin:
         logger.info({
             "action": "update admin from db",
             "current_admin": current_admin.id,
@@ -86,12 +106,14 @@ class AdminCrud:
         try:
             update_process = UpdateProcess()
             db_admin = update_process.admin_process(current_admin, new_admin)
-            db.commit()
+            await db.commit()
         except Exception as ex:
             logger.error("Failed update admin user")
-            db.rollback()
+            await db.rollback()
             raise ex
 
+        principal_cache.delete(db_admin.id)
+
         logger.info({
             "action": "update admin from db",
             "status": "success"
@@ -99,44 +121,64 @@ class AdminCrud:
 
         return db_admin
 
-    def activate_admin(self, db_admin: Admin, db: Session) -> Admin:
+    async def activate_admin(self, db_admin: Admin, db: AsyncSession) -> Admin:
         try:
             db_admin.email_verified = True
             db_admin.is_active = True
-            db.commit()
+            await db.commit()
         except Exception as ex:
-            db.rollback()
+            await db.rollback()
             raise ex
 
+        principal_cache.delete(db_admin.id)
+
         return db_admin
 
-    def update_password(self, new_password: str, db_admin: Admin, db: Session) -> bool:
+    async def update_password(self, new_password: str, db_admin: Admin, db: AsyncSession) -> bool:
         try:
-            hashed_password = auth_service.get_password_hash(new_password)
+            hashed_password = await auth_service.get_password_hash(new_password)
             db_admin.hashed_password = hashed_password
-            db.commit()
+            await db.commit()
         except Exception as ex:
-            db.rollback()
+            await db.rollback()
             raise ex
 
+        principal_cache.delete(db_admin.id)
+
         return True
 
-    def delete_admin(self, current_admin: Admin, db: Session) -> bool:
+    async def update_password_hash(self, hashed_password: str, db_admin: Admin, db: AsyncSession) -> None:
+        # Stores a hash already computed during login, e.g. after a scheme or cost change
+        try:
+            db_admin.hashed_password = hashed_password
+            await db.commit()
+        except Exception as ex:
+            await db.rollback()
+            raise ex
+
+        principal_cache.delete(db_admin.id)
+
+    async def delete_admin(self, admin_id: UUID, db: AsyncSession) -> bool:
         logger.info({
             "action": "delete admin from db",
-            "current_admin": current_admin.id,
+            "current_admin": admin_id,
             "status": "run"
         })
 
         try:
-            db.delete(current_admin)
-            db.commit()
+            # Detach the admin's posts as the ORM relationship did, without loading them
+            await db.execute(update(Post).where(Post.author_id == admin_id).values(author_id=None))
+            result = await db.execute(delete(Admin).where(Admin.id == admin_id))
+            deleted_count = result.rowcount
+            await db.commit()
         except Exception as e:
             logger.error("Failed delete admin user from DB")
-            db.rollback()
+            await db.rollback()
             raise e
 
-        if not self.get_admin_by_id(current_admin.id, db):
+        principal_cache.delete(admin_id)
+
+        if deleted_count:
             logger.info({
                 "action": "delete admin from db",
                 "status": "success"
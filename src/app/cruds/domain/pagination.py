@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, desc, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from models import Post
+from exceptions import BadRequestError
+
+
+def encode_cursor(updated_at: datetime, post_id: UUID) -> str:
+    raw = json.dumps([updated_at.isoformat(), post_id.hex]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        updated_at, post_id = json.loads(raw)
+        return datetime.fromisoformat(updated_at), UUID(post_id)
+    except Exception:
+        # The cursor comes from the client, so any malformed value is its error, whatever the decoder raises
+        raise BadRequestError(output_message="The cursor is invalid")
+
+
+def keyset_statement(statement: Select, limit: int, cursor: Optional[str]) -> Select:
+    # The cursor points at the last row of the previous page,
+    # so every page is a range scan on (updated_at, id) instead of an OFFSET scan
+    if cursor:
+        updated_at, post_id = decode_cursor(cursor)
+        # Compared against the column, so the values are bound through its type in the format it stores
+        statement = statement.where(or_(
+            Post.updated_at < updated_at,
+            and_(Post.updated_at == updated_at, Post.id < post_id)
+        ))
+
+    # Fetch one extra row to know whether a next page exists
+    return statement.order_by(desc(Post.updated_at), desc(Post.id)).limit(limit + 1)
+
+
+def keyset_result(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].updated_at, rows[-1].id)
+
+
+async def keyset_page(
+        statement: Select, limit: int, cursor: Optional[str], db: AsyncSession
+) -> Tuple[List[Post], Optional[str]]:
+    result = await db.execute(keyset_statement(statement, limit, cursor))
+    return keyset_result(result.scalars().all(), limit)
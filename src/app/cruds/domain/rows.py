@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Post, Tag
+from models.post import tag_post_map_table
+
+
+# Read-only rows for the public list responses. They expose the same attribute names as the ORM models,
+# so the post_schema models and the fragment cache serialize them unchanged.
+
+class TagRow(NamedTuple):
+    id: UUID
+    title: str
+    slug: Optional[str]
+
+
+class PostSummaryRow(NamedTuple):
+    id: UUID
+    title: str
+    url_slug: Optional[str]
+    thumbnail: Optional[str]
+    is_public: bool
+    created_at: datetime
+    updated_at: datetime
+    tags: List[TagRow]
+
+
+class PostSearchRow(NamedTuple):
+    id: UUID
+    title: str
+    url_slug: Optional[str]
+    thumbnail: Optional[str]
+    is_public: bool
+    created_at: datetime
+    updated_at: datetime
+    snippet: str
+    tags: List[TagRow]
+
+
+class TagWithPostsRow(NamedTuple):
+    id: UUID
+    title: str
+    slug: Optional[str]
+    posts: List[PostSummaryRow]
+
+
+POST_SUMMARY_COLUMNS = (
+    Post.id, Post.title, Post.url_slug, Post.thumbnail, Post.is_public, Post.created_at, Post.updated_at
+)
+
+
+async def with_tags(post_rows: List, db: AsyncSession) -> List[PostSummaryRow]:
+    tags_by_post_id = await load_tags(post_rows, db)
+
+    return [PostSummaryRow(*row, tags_by_post_id.get(row.id, [])) for row in post_rows]
+
+
+async def load_tags(post_rows: Iterable, db: AsyncSession) -> Dict[UUID, List[TagRow]]:
+    # One query loads every tag of the given posts, grouped per post in a single pass
+    post_ids = [row.id for row in post_rows]
+    if not post_ids:
+        return {}
+
+    result = await db.execute(
+        select(tag_post_map_table.c.post_id, Tag.id, Tag.title, Tag.slug)
+        .join(Tag, Tag.id == tag_post_map_table.c.tag_id)
+        .where(tag_post_map_table.c.post_id.in_(post_ids))
+    )
+
+    # A tag shared by many posts is materialized once
+    tags: Dict[UUID, TagRow] = {}
+    tags_by_post_id: Dict[UUID, List[TagRow]] = {}
+    for post_id, tag_id, title, slug in result:
+        tag = tags.get(tag_id)
+        if tag is None:
+            tag = tags[tag_id] = TagRow(tag_id, title, slug)
+        tags_by_post_id.setdefault(post_id, []).append(tag)
+
+    return tags_by_post_id
@@ -0,0 +1,44 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+from .transformer import slug_transformer
+
+# Generated slugs leave room for a "-<n>" collision suffix within the column length
+SUFFIX_RESERVE = 6
+
+
+class SlugService:
+
+    async def slug_exists(
+            self, column: InstrumentedAttribute, slug: str, db: AsyncSession, exclude_id: Optional[UUID] = None
+    ) -> bool:
+        # Point lookup on the unique slug index
+        statement = select(column).where(column == slug).limit(1)
+        if exclude_id is not None:
+            statement = statement.where(column.class_.id != exclude_id)
+        result = await db.execute(statement)
+        return result.first() is not None
+
+    async def unique_slug(self, column: InstrumentedAttribute, text: str, db: AsyncSession) -> str:
+        base = slug_transformer(text)[:column.type.length - SUFFIX_RESERVE]
+        if not base:
+            # An empty title would match every slug with the range below and store an empty slug,
+            # so the model name ("post", "tag") stands in for it
+            base = column.class_.__name__.lower()
+
+        # One index range scan returns the slug and every suffixed variant of it: "." sorts right after "-".
+        # A prefix LIKE would do the same on MariaDB, but SQLite's case-insensitive LIKE cannot use the index.
+        result = await db.execute(select(column).where(column >= base, column < f"{base}."))
+        taken = {slug.lower() for slug in result.scalars().all() if slug}
+        if base not in taken:
+            return base
+
+        prefix = f"{base}-"
+        suffixes = [
+            int(slug[len(prefix):]) for slug in taken if slug.startswith(prefix) and slug[len(prefix):].isdigit()
+        ]
+        return f"{prefix}{max(suffixes, default=1) + 1}"
@@ -0,0 +1,31 @@
+import html
+import re
+from typing import Iterable, List
+
+# Control characters mark highlights until the snippet is escaped; strip_markers() removes them from post text first
+MARK_START = "\x02"
+MARK_END = "\x03"
+ELLIPSIS = "…"
+
+
+def search_terms(query: str, max_terms: int) -> List[str]:
+    terms = []
+    for term in re.findall(r"\w+", query.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:max_terms]
+
+
+def strip_markers(text: str) -> str:
+    # Markers already in the text would render as unbalanced <mark> tags
+    return text.replace(MARK_START, "").replace(MARK_END, "")
+
+
+def mark_terms(text: str, terms: Iterable[str]) -> str:
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+    return pattern.sub(lambda match: f"{MARK_START}{match.group(0)}{MARK_END}", text)
+
+
+def render_snippet(text: str) -> str:
+    # Escaped so the client can insert the snippet as HTML; only the <mark> tags are markup
+    return html.escape(text).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
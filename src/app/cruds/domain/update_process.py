@@ -3,10 +3,8 @@ from schemas.tag import TagUpdate
 from schemas.admin import AdminUpdate
 from models import Post, Tag, Admin
 from utils.logger import setup_logger
-import datetime
 
-log_folder = f"log/{datetime.date.today()}.log"
-logger = setup_logger(log_folder=log_folder, modname=__name__)
+logger = setup_logger(modname=__name__)
 
 
 class UpdateProcess:
@@ -1,24 +1,32 @@
-from typing import List
+from typing import Iterable, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer_group
 
-from models import Post
+from models import Post, Tag
+from models.post import tag_post_map_table
+from models.mixins import current_timestamp_precise
 from schemas import post_schema
-from .domain import UpdateProcess
-from .domain.transformer import slug_transformer
+from .domain import UpdateProcess, MapPostAndTags
+from .domain.slug import SlugService
+from .domain.pagination import keyset_page
 from exceptions import AlreadyRegisteredError
+from services import response_cache, fragment_cache
+from services.cache import POST_LIST, post_label, tag_posts_label
 from utils.logger import setup_logger
 import datetime
 
-log_folder = f"log/{datetime.date.today()}.log"
-logger = setup_logger(log_folder=log_folder, modname=__name__)
+logger = setup_logger(modname=__name__)
 
 
 class PostCrud:
 
-    def get_my_posts(self, admin_id: UUID, db: Session) -> List[Post]:
+    slug_service = SlugService()
+    map_post_tags = MapPostAndTags()
+
+    async def get_my_posts(self, admin_id: UUID, db: AsyncSession) -> List[Post]:
         logger.info({
             "action": "Get my posts",
             "admin_id": admin_id,
@@ -26,10 +34,13 @@ class PostCrud:
         })
 
         try:
-            posts = db.query(Post)\
-                .filter(Post.author_id == admin_id)\
-                .order_by(desc(Post.updated_at))\
-                .all()
+            result = await db.execute(
+                select(Post)
+                .options(selectinload(Post.tags))
+                .where(Post.author_id == admin_id)
+                .order_by(desc(Post.updated_at))
+            )
+            posts = result.scalars().all()
         except Exception as ex:
             logger.error(f"Failed get my (id: {admin_id}) posts from db")
             raise ex
@@ -44,32 +55,55 @@ class PostCrud:
 
         return posts
 
-    def get_public_posts(self, db: Session) -> List[Post]:
+    async def get_my_posts_page(
+            self, admin_id: UUID, limit: int, cursor: Optional[str], db: AsyncSession
+    ) -> Tuple[List[Post], Optional[str]]:
         logger.info({
-            "action": "Get public posts",
+            "action": "Get my posts page",
+            "admin_id": admin_id,
             "status": "Run"
         })
 
         try:
-            posts = db.query(Post)\
-                .filter(Post.is_public.is_(True))\
-                .order_by(desc(Post.updated_at))\
-                .all()
+            statement = select(Post)\
+                .options(selectinload(Post.tags))\
+                .where(Post.author_id == admin_id)
+            posts, next_cursor = await keyset_page(statement, limit, cursor, db)
         except Exception as ex:
-            logger.error("Failed get public posts from db")
+            logger.error(f"Failed get my (id: {admin_id}) posts page from db")
             raise ex
 
         logger.info({
-            "action": "Get public posts",
+            "action": "Get my posts page",
             "status": "Success"
         })
 
-        if not posts:
-            logger.warning("Public post list is empty")
+        return posts, next_cursor
 
-        return posts
+    async def get_public_posts_version(self, db: AsyncSession) -> Tuple[int, Optional[datetime.datetime]]:
+        result = await db.execute(
+            select(func.count(Post.id), func.max(Post.updated_at))
+            .where(Post.is_public.is_(True))
+        )
+        count, last_updated_at = result.one()
+
+        return count, last_updated_at
 
-    def get_post(self, post_id: UUID, db: Session) -> Post:
+    async def get_public_post_version(
+            self, post_slug: str, db: AsyncSession
+    ) -> Optional[Tuple[datetime.datetime, int, Optional[datetime.datetime]]]:
+        result = await db.execute(
+            select(Post.updated_at, func.count(Tag.id), func.max(Tag.updated_at))
+            .select_from(Post)
+            .outerjoin(Post.tags)
+            .where(Post.url_slug == post_slug, Post.is_public.is_(True))
+            .group_by(Post.id, Post.updated_at)
+        )
+        version = result.first()
+
+        return tuple(version) if version else None
+
+    async def get_post(self, post_id: UUID, db: AsyncSession) -> Post:
         logger.info({
             "action": "Get post by id",
             "post_id": post_id,
@@ -77,7 +111,14 @@ class PostCrud:
         })
 
         try:
-            post = db.query(Post).filter(Post.id == post_id).first()
+            # populate_existing reloads server-side values (updated_at) of a post this session just wrote
+            result = await db.execute(
+                select(Post)
+                .options(undefer_group("body"), selectinload(Post.tags))
+                .where(Post.id == post_id)
+                .execution_options(populate_existing=True)
+            )
+            post = result.scalars().first()
         except Exception as ex:
             logger.error("Failed get post by id from db")
             raise ex
@@ -89,14 +130,45 @@ class PostCrud:
 
         return post
 
-    def get_public_post_by_slug(self, post_slug: str, db: Session) -> Post:
+    async def get_owned_post(self, post_id: UUID, author_id: UUID, db: AsyncSession) -> Optional[Post]:
+        logger.info({
+            "action": "Get owned post by id",
+            "post_id": post_id,
+            "status": "Run"
+        })
+
+        try:
+            # Ownership is part of the lookup, so another admin's post is simply not found
+            result = await db.execute(
+                select(Post)
+                .options(undefer_group("body"), selectinload(Post.tags))
+                .where(Post.id == post_id, Post.author_id == author_id)
+            )
+            post = result.scalars().first()
+        except Exception as ex:
+            logger.error("Failed get owned post by id from db")
+            raise ex
+
+        logger.info({
+            "action": "Get owned post by id",
+            "status": "Success"
+        })
+
+        return post
+
+    async def get_public_post_by_slug(self, post_slug: str, db: AsyncSession) -> Post:
         logger.info({
             "action": "Get post by slug",
             "post_slug": post_slug,
             "status": "Run"
         })
         try:
-            post = db.query(Post).filter(Post.url_slug == post_slug and Post.is_public is True).first()
+            result = await db.execute(
+                select(Post)
+                .options(undefer_group("body"), selectinload(Post.tags))
+                .where(Post.url_slug == post_slug, Post.is_public.is_(True))
+            )
+            post = result.scalars().first()
         except Exception as ex:
             logger.error("Failed get post by slug from db")
             raise ex
@@ -108,41 +180,76 @@ class PostCrud:
 
         return post
 
-    def create_post(self, admin_id: UUID, data: post_schema.PostCreate, db: Session) -> Post:
-        if not data.url_slug:
+    async def create_post(
+            self, admin_id: UUID, data: post_schema.PostCreate, tag_ids: Iterable[UUID], db: AsyncSession
+    ) -> Post:
+        if data.url_slug:
+            if await self.slug_service.slug_exists(Post.url_slug, data.url_slug, db):
+                raise AlreadyRegisteredError(output_message="The url-slug has already registered")
+        else:
             data = data.copy()
-            data.url_slug = slug_transformer(data.title)
+            data.url_slug = await self.slug_service.unique_slug(Post.url_slug, data.title, db)
 
-        db_url_slugs = db.query(Post.url_slug).all()
-        if data.url_slug in db_url_slugs:
-            raise AlreadyRegisteredError(output_message="The url-slug has already registered")
+        # The post and its tag mapping are written in one transaction with a single commit
+        try:
+            new_post = Post(**data.dict(), author_id=admin_id)
+            db.add(new_post)
+            await db.flush()
+            changed_tag_ids = await self.map_post_tags.reconcile(new_post.id, set(), tag_ids, db)
+            await db.commit()
+        except Exception as ex:
+            await db.rollback()
+            raise ex
 
-        new_post = Post(**data.dict(), author_id=admin_id)
-        db.add(new_post)
-        db.commit()
-        db.refresh(new_post)
-        return new_post
+        response_cache.invalidate(POST_LIST, *[tag_posts_label(tag_id) for tag_id in changed_tag_ids])
+        return await self.get_post(new_post.id, db)
 
-    def update_post(self, db_post: Post, new_post: post_schema.PostUpdate, db: Session) -> Post:
+    async def update_post(
+            self, db_post: Post, new_post: post_schema.PostUpdate, tag_ids: Optional[Iterable[UUID]], db: AsyncSession
+    ) -> Post:
         logger.info({
             "action": "Update post",
             "data": new_post.is_public,
             "status": "Run"
         })
+        if new_post.url_slug and await self.slug_service.slug_exists(
+                Post.url_slug, new_post.url_slug, db, exclude_id=db_post.id):
+            raise AlreadyRegisteredError(output_message="The url-slug has already registered")
+
+        current_tag_ids = {tag.id for tag in db_post.tags}
+        changed_tag_ids = set()
         try:
             update_process = UpdateProcess()
             db_post = update_process.post_process(db_post, new_post)
-            db.commit()
+            if tag_ids is not None:
+                changed_tag_ids = await self.map_post_tags.reconcile(db_post.id, current_tag_ids, tag_ids, db)
+            if changed_tag_ids:
+                # Tag mapping rows carry no timestamp, so the post's updated_at versions its tag set
+                db_post.updated_at = current_timestamp_precise()
+            await db.commit()
+        except Exception as ex:
+            await db.rollback()
+            raise ex
 
-        except Exception as e:
-            raise e
+        response_cache.invalidate(
+            POST_LIST, post_label(db_post.id),
+            *[tag_posts_label(tag_id) for tag_id in current_tag_ids | changed_tag_ids]
+        )
+        fragment_cache.invalidate(post_label(db_post.id))
 
-        return db_post
+        return await self.get_post(db_post.id, db)
 
-    def delete_post(self, db_post: Post, db: Session):
+    async def delete_post(self, db_post: Post, db: AsyncSession) -> bool:
+        labels = [POST_LIST, post_label(db_post.id), *[tag_posts_label(tag.id) for tag in db_post.tags]]
         try:
-            db.delete(db_post)
-            db.commit()
+            await db.execute(delete(tag_post_map_table).where(tag_post_map_table.c.post_id == db_post.id))
+            result = await db.execute(delete(Post).where(Post.id == db_post.id))
+            await db.commit()
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise e
+
+        response_cache.invalidate(*labels)
+        fragment_cache.invalidate(post_label(db_post.id))
+
+        return result.rowcount == 1
@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Post, Tag
+from models.post import tag_post_map_table
+from .domain.pagination import keyset_statement, keyset_result
+from .domain.rows import POST_SUMMARY_COLUMNS, PostSummaryRow, TagWithPostsRow, with_tags
+from utils.logger import setup_logger
+
+logger = setup_logger(modname=__name__)
+
+
+class PublicReadCrud:
+    # Read-only counterpart of PostCrud/TagCrud for the public list routes.
+    # Core selects build plain rows, with no identity map, instance state or lazy loaders.
+
+    async def get_public_posts(self, db: AsyncSession) -> List[PostSummaryRow]:
+        logger.info({
+            "action": "Read public posts",
+            "status": "Run"
+        })
+
+        try:
+            result = await db.execute(
+                select(*POST_SUMMARY_COLUMNS)
+                .where(Post.is_public.is_(True))
+                .order_by(desc(Post.updated_at), desc(Post.id))
+            )
+            posts = await with_tags(result.all(), db)
+        except Exception as ex:
+            logger.error("Failed read public posts from db")
+            raise ex
+
+        logger.info({
+            "action": "Read public posts",
+            "status": "Success"
+        })
+
+        return posts
+
+    async def get_public_posts_page(
+            self, limit: int, cursor: Optional[str], db: AsyncSession
+    ) -> Tuple[List[PostSummaryRow], Optional[str]]:
+        logger.info({
+            "action": "Read public posts page",
+            "status": "Run"
+        })
+
+        try:
+            statement = select(*POST_SUMMARY_COLUMNS).where(Post.is_public.is_(True))
+            result = await db.execute(keyset_statement(statement, limit, cursor))
+            post_rows, next_cursor = keyset_result(result.all(), limit)
+            posts = await with_tags(post_rows, db)
+        except Exception as ex:
+            logger.error("Failed read public posts page from db")
+            raise ex
+
+        logger.info({
+            "action": "Read public posts page",
+            "status": "Success"
+        })
+
+        return posts, next_cursor
+
+    async def get_tag_with_posts(self, tag_slug: str, db: AsyncSession) -> Optional[TagWithPostsRow]:
+        logger.info({
+            "action": "Read tag with posts",
+            "tag_slug": tag_slug,
+            "status": "Run"
+        })
+
+        try:
+            result = await db.execute(select(Tag.id, Tag.title, Tag.slug).where(Tag.slug == tag_slug))
+            tag = result.first()
+            if not tag:
+                return None
+
+            # Only public posts are listed on the tag page
+            result = await db.execute(
+                select(*POST_SUMMARY_COLUMNS)
+                .join(tag_post_map_table, tag_post_map_table.c.post_id == Post.id)
+                .where(tag_post_map_table.c.tag_id == tag.id, Post.is_public.is_(True))
+                .order_by(desc(Post.updated_at), desc(Post.id))
+            )
+            posts = await with_tags(result.all(), db)
+        except Exception as ex:
+            logger.error(f"Failed read tag (slug: {tag_slug}) with posts from db")
+            raise ex
+
+        logger.info({
+            "action": "Read tag with posts",
+            "status": "Success"
+        })
+
+        return TagWithPostsRow(*tag, posts)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import RevokedToken
+from services import auth_service
+from utils.logger import setup_logger
+
+logger = setup_logger(modname=__name__)
+
+
+class RevokedTokenCrud:
+
+    async def create_revoked_token(self, jti: str, exp: int, db: AsyncSession) -> None:
+        logger.info({
+            "action": "revoke token",
+            "jti": jti,
+            "status": "run"
+        })
+
+        try:
+            await db.merge(RevokedToken(jti=jti, expires_at=datetime.utcfromtimestamp(exp)))
+            await db.commit()
+        except Exception as ex:
+            logger.error("Failed insertion of revoked token to db")
+            await db.rollback()
+            raise ex
+
+        # Other processes pick the row up at their next sync
+        auth_service.revocation_store.add(jti, exp)
+
+        logger.info({
+            "action": "revoke token",
+            "status": "success"
+        })
@@ -0,0 +1,102 @@
+from typing import List, Optional, Tuple
+
+from sqlalchemy import desc, func, literal_column, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select, column, table
+
+from models import Post
+from .domain.rows import POST_SUMMARY_COLUMNS, PostSearchRow, load_tags
+from .domain.snippet import MARK_START, MARK_END, ELLIPSIS, search_terms, strip_markers, mark_terms, render_snippet
+from utils.logger import setup_logger
+
+logger = setup_logger(modname=__name__)
+
+MAX_TERMS = 8
+# MariaDB: characters of content around the first matched term; SQLite: tokens chosen by FTS5's snippet()
+SNIPPET_CHARS = 200
+SNIPPET_CONTEXT = 60
+SNIPPET_TOKENS = 32
+
+# FTS5 index of SQLite local runs, created with the posts table (see models/post.py)
+posts_fts = table("posts_fts", column("post_id"))
+
+
+class SearchCrud:
+    # MariaDB searches the FULLTEXT index on (title, description, content); SQLite an FTS5 table over the same columns
+
+    async def search_public_posts(
+            self, query: str, limit: int, offset: int, db: AsyncSession
+    ) -> Tuple[List[PostSearchRow], Optional[int]]:
+        logger.info({
+            "action": "Search public posts",
+            "query": query,
+            "status": "Run"
+        })
+
+        terms = search_terms(query, MAX_TERMS)
+        if not terms:
+            return [], None
+
+        try:
+            fts5 = db.bind.dialect.name == "sqlite"
+            statement = self._fts5_statement(terms) if fts5 else self._fulltext_statement(terms)
+            # Fetch one extra row to know whether a next page exists
+            result = await db.execute(statement.limit(limit + 1).offset(offset))
+            post_rows = result.all()
+            next_offset = offset + limit if len(post_rows) > limit else None
+
+            post_rows = post_rows[:limit]
+            tags_by_post_id = await load_tags(post_rows, db)
+            posts = [
+                PostSearchRow(
+                    *row[:len(POST_SUMMARY_COLUMNS)],
+                    render_snippet(row.snippet or "") if fts5 else self._window_snippet(row, terms),
+                    tags_by_post_id.get(row.id, [])
+                )
+                for row in post_rows
+            ]
+        except Exception as ex:
+            logger.error("Failed search public posts in db")
+            raise ex
+
+        logger.info({
+            "action": "Search public posts",
+            "status": "Success"
+        })
+
+        return posts, next_offset
+
+    def _fulltext_statement(self, terms: List[str]) -> Select:
+        score = match(Post.title, Post.description, Post.content, against=" ".join(terms)).in_natural_language_mode()
+
+        # Only a window of the content around the first matched term leaves the database
+        position = func.coalesce(*[func.nullif(func.locate(term, Post.content), 0) for term in terms], 1)
+        start = func.greatest(position - SNIPPET_CONTEXT, 1)
+        window = func.substring(Post.content, start, SNIPPET_CHARS + 1)
+
+        return select(*POST_SUMMARY_COLUMNS, window.label("snippet"), start.label("snippet_start"))\
+            .where(Post.is_public.is_(True), score)\
+            .order_by(desc(score), Post.id)
+
+    def _fts5_statement(self, terms: List[str]) -> Select:
+        fts = literal_column("posts_fts")
+        # Quoted terms keep user input out of the FTS5 query syntax
+        fts_query = " OR ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+        # Column 3 is content, after post_id, title and description
+        snippet = func.snippet(fts, 3, MARK_START, MARK_END, ELLIPSIS, SNIPPET_TOKENS)
+
+        return select(*POST_SUMMARY_COLUMNS, snippet.label("snippet"))\
+            .select_from(Post)\
+            .join(posts_fts, posts_fts.c.post_id == Post.id)\
+            .where(fts.op("MATCH")(fts_query), Post.is_public.is_(True))\
+            .order_by(func.bm25(fts), Post.id)
+
+    def _window_snippet(self, row, terms: List[str]) -> str:
+        # FTS5 snippets come back trimmed and marked; the MariaDB content window is trimmed and marked here
+        text = strip_markers(row.snippet or "")
+        if len(text) > SNIPPET_CHARS:
+            text = text[:SNIPPET_CHARS] + ELLIPSIS
+        if row.snippet_start > 1:
+            text = ELLIPSIS + text
+        return render_snippet(mark_terms(text, terms))
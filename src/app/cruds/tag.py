@@ -1,30 +1,35 @@
-from sqlalchemy.orm import Session
-from typing import List, Union
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 from uuid import UUID
-from models import Tag
+from models import Tag, Post
+from models.post import tag_post_map_table
 from schemas import tag_schema
 from .domain import UpdateProcess
-from .domain.transformer import slug_transformer
-from exceptions import ObjectNotFoundError, BadRequestError
+from .domain.slug import SlugService
+from exceptions import ObjectNotFoundError, BadRequestError, AlreadyRegisteredError
+from services import response_cache, fragment_cache
+from services.cache import POST_LIST, TAG_LIST, tag_label, post_label
 
 from utils.logger import setup_logger
 import datetime
 
-log_folder = f"log/{datetime.date.today()}.log"
-logger = setup_logger(log_folder=log_folder, modname=__name__)
+logger = setup_logger(modname=__name__)
 
 
 class TagCrud:
 
     update_process = UpdateProcess()
+    slug_service = SlugService()
 
-    def get_tags(self, db: Session) -> List[Tag]:
+    async def get_tags(self, db: AsyncSession) -> List[Tag]:
         logger.info({
             "action": "get all tags",
             "status": "run"
         })
 
-        tags = db.query(Tag).order_by(Tag.title).all()
+        result = await db.execute(select(Tag).order_by(Tag.title))
+        tags = result.scalars().all()
 
         logger.info({
             "action": "get all tags",
@@ -33,14 +38,15 @@ class TagCrud:
 
         return tags
 
-    def get_tag(self, tag_id: UUID, db: Session) -> Tag:
+    async def get_tag(self, tag_id: UUID, db: AsyncSession) -> Tag:
         logger.info({
             "action": "get tag by id",
             "tag_id": tag_id,
             "status": "run"
         })
 
-        db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
+        result = await db.execute(select(Tag).where(Tag.id == tag_id))
+        db_tag = result.scalars().first()
 
         logger.info({
             "action": "get tag by id",
@@ -49,50 +55,74 @@ class TagCrud:
 
         return db_tag
 
-    def get_tag_by_slug(self, tag_slug: str, db: Session) -> Union[Tag, bool]:
-        logger.info({
-            "action": "get tag by title",
-            "tag_id": tag_slug,
-            "status": "run"
-        })
-
-        db_tag = db.query(Tag).filter(Tag.slug == tag_slug).first()
-        if not db_tag:
-            return False
-
-        logger.info({
-            "action": "get tag by title",
-            "status": "success"
-        })
-
-        return db_tag
-
-    def create_tag(self, tag: tag_schema.TagCreate, db: Session) -> Tag:
+    async def get_tag_by_title(self, title: str, db: AsyncSession) -> Optional[Tag]:
+        result = await db.execute(select(Tag).where(Tag.title == title))
+        return result.scalars().first()
+
+    async def get_tags_version(self, db: AsyncSession) -> Tuple[int, Optional[datetime.datetime]]:
+        result = await db.execute(select(func.count(Tag.id), func.max(Tag.updated_at)))
+        count, last_updated_at = result.one()
+
+        return count, last_updated_at
+
+    async def get_public_post_tags_version(self, db: AsyncSession) -> Tuple[int, Optional[datetime.datetime]]:
+        # Only tags embedded in public posts: creating or renaming a tag no public post carries changes nothing
+        result = await db.execute(
+            select(func.count(), func.max(Tag.updated_at))
+            .select_from(tag_post_map_table)
+            .join(Post, Post.id == tag_post_map_table.c.post_id)
+            .join(Tag, Tag.id == tag_post_map_table.c.tag_id)
+            .where(Post.is_public.is_(True))
+        )
+        count, last_updated_at = result.one()
+
+        return count, last_updated_at
+
+    async def get_tag_version(
+            self, tag_slug: str, db: AsyncSession
+    ) -> Optional[Tuple[datetime.datetime, int, Optional[datetime.datetime]]]:
+        result = await db.execute(
+            select(Tag.updated_at, func.count(Post.id), func.max(Post.updated_at))
+            .select_from(Tag)
+            .outerjoin(Tag.posts.and_(Post.is_public.is_(True)))
+            .where(Tag.slug == tag_slug)
+            .group_by(Tag.id, Tag.updated_at)
+        )
+        version = result.first()
+
+        return tuple(version) if version else None
+
+    async def create_tag(self, tag: tag_schema.TagCreate, db: AsyncSession) -> Tag:
         logger.info({
             "action": "create new tag object",
             "tag": f"{tag.title}, {tag.slug}",
             "status": "run"
         })
-        if tag.slug is None:
-            tag.slug = slug_transformer(tag.title)
+        if tag.slug:
+            if await self.slug_service.slug_exists(Tag.slug, tag.slug, db):
+                raise AlreadyRegisteredError(output_message="The Tag slug already registered")
+        else:
+            tag.slug = await self.slug_service.unique_slug(Tag.slug, tag.title, db)
 
         try:
             db_tag = Tag(title=tag.title, slug=tag.slug)
             db.add(db_tag)
-            db.commit()
-            db.refresh(db_tag)
+            await db.commit()
+            await db.refresh(db_tag)
         except Exception:
             logger.error("Failed insertion of new tag to db")
-            db.rollback()
+            await db.rollback()
             raise BadRequestError(output_message="Failed insertion of new tag to db")
 
+        response_cache.invalidate(TAG_LIST)
+
         logger.info({
             "action": "create new tag object",
             "status": "success"
         })
         return db_tag
 
-    def update_tag(self, tag_id: UUID, new_tag: tag_schema.TagUpdate, db: Session) -> Tag:
+    async def update_tag(self, tag_id: UUID, new_tag: tag_schema.TagUpdate, db: AsyncSession) -> Tag:
         logger.info({
             "action": "Update tag object",
             "tag_id": tag_id,
@@ -100,20 +130,25 @@ class TagCrud:
             "status": "run"
         })
 
-        db_tag = self.get_tag(tag_id, db)
+        db_tag = await self.get_tag(tag_id, db)
         if not db_tag:
             logger.error(f"Failed get tag by id: {tag_id} from db")
             raise ObjectNotFoundError(output_message="The Tag was not found by ID")
+        if new_tag.slug and await self.slug_service.slug_exists(Tag.slug, new_tag.slug, db, exclude_id=tag_id):
+            raise AlreadyRegisteredError(output_message="The Tag slug already registered")
 
         try:
             update_process = UpdateProcess()
             db_tag = update_process.tag_process(db_tag, new_tag)
-            db.commit()
+            await db.commit()
         except Exception as ex:
             logger.error(f"Failed update tag with title: {new_tag.title} and slug: {new_tag.slug}")
-            db.rollback()
+            await db.rollback()
             raise ex
 
+        response_cache.invalidate(TAG_LIST, POST_LIST, tag_label(tag_id))
+        fragment_cache.invalidate(tag_label(tag_id))
+
         logger.info({
             "action": "Update tag object",
             "status": "Success"
@@ -121,29 +156,38 @@ class TagCrud:
 
         return db_tag
 
-    def delete_tag(self, tag_id: UUID, db: Session) -> bool:
+    async def delete_tag(self, tag_id: UUID, db: AsyncSession) -> bool:
         logger.info({
             "action": "Delete tag object",
             "tag_id": tag_id,
             "status": "Run"
         })
 
-        db_tag = self.get_tag(tag_id, db)
-        if not db_tag:
-            logger.error(f"Failed get tag by id: {tag_id} from db")
-            raise ObjectNotFoundError(output_message="The Tag was not found by ID")
-
         try:
-            db.delete(db_tag)
-            db.commit()
+            result = await db.execute(
+                select(tag_post_map_table.c.post_id).where(tag_post_map_table.c.tag_id == tag_id)
+            )
+            post_ids = result.scalars().all()
+            await db.execute(delete(tag_post_map_table).where(tag_post_map_table.c.tag_id == tag_id))
+            result = await db.execute(delete(Tag).where(Tag.id == tag_id))
+            deleted_count = result.rowcount
+            if deleted_count:
+                await db.commit()
+            else:
+                await db.rollback()
         except Exception as ex:
             logger.error("Delete tag object has failed")
-            db.rollback()
+            await db.rollback()
             raise ex
 
-        if self.get_tag(tag_id, db):
-            logger.warning("Delete process is done but the object has not deleted")
-            return False
+        if not deleted_count:
+            logger.error(f"Failed get tag by id: {tag_id} from db")
+            raise ObjectNotFoundError(output_message="The Tag was not found by ID")
+
+        response_cache.invalidate(
+            TAG_LIST, POST_LIST, tag_label(tag_id), *[post_label(post_id) for post_id in post_ids]
+        )
+        fragment_cache.invalidate(tag_label(tag_id))
 
         logger.info({
             "action": "Delete tag object",
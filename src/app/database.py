@@ -1,20 +1,91 @@
-from sqlalchemy import create_engine
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
-from utils.env import DB_USER, DB_PASSWORD, DB_DATABASE, DB_HOST
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from utils.env import DATABASE_URL, DB_ECHO, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_POOL_PRE_PING, \
+    DB_POOL_TIMEOUT
+
+
+class PoolMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+
+pool_metrics = PoolMetrics()
 
-DATABASE = f"mysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_DATABASE}?charset=utf8"
 
-engine = create_engine(DATABASE, encoding="utf-8", echo=True)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
 
-SessionLocal = scoped_session(
-    sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+engine_options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+# SQLite (local runs) keeps the dialect's default pool, which takes no sizing options
+if not DATABASE_URL.startswith("sqlite"):
+    engine_options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT,
+    )
+
+engine = create_async_engine(DATABASE_URL, **engine_options)
+
+# Objects stay usable after commit; async sessions cannot lazy load expired attributes
+AsyncSessionLocal = sessionmaker(
+    engine, class_=AsyncSession, autocommit=False, autoflush=False, expire_on_commit=False
 )
 
 Base = declarative_base()
-Base.query = SessionLocal.query_property()
 
 
-def get_db():
-    with SessionLocal() as session:
+def get_pool_stats() -> dict:
+    pool = engine.sync_engine.pool
+    is_queue_pool = isinstance(pool, InstrumentedQueuePool)
+    checkouts = pool_metrics.checkouts
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size() if is_queue_pool else None,
+        "checked_in": pool.checkedin() if is_queue_pool else None,
+        "checked_out": pool.checkedout() if is_queue_pool else None,
+        "overflow": pool.overflow() if is_queue_pool else None,
+        "max_overflow": DB_MAX_OVERFLOW if is_queue_pool else None,
+        "checkouts": checkouts,
+        "checkout_timeouts": pool_metrics.checkout_timeouts,
+        "average_wait_ms": pool_metrics.total_wait_seconds / checkouts * 1000 if checkouts else 0.0,
+        "max_wait_ms": pool_metrics.max_wait_seconds * 1000,
+    }
+
+
+async def get_db():
+    async with AsyncSessionLocal() as session:
         yield session
@@ -3,6 +3,7 @@ from .core_errors import \
     AlreadyRegisteredError, \
     ObjectNotFoundError, \
     BadRequestError, \
+    TooManyRequestsError, \
     ValidationError
 
 from .csrf_errors import csrf_errors_list
@@ -1,3 +1,4 @@
+import math
 from typing import Dict, List
 
 
@@ -56,6 +57,23 @@ class ObjectNotFoundError(ApiException):
             self.message_list = [output_message]
 
 
+class TooManyRequestsError(ApiException):
+    status_code = 429
+    error_code = "Too Many Requests"
+
+    def __init__(
+            self,
+            output_message: str = "Too many requests, please retry later",
+            message_list: List[str] = None,
+            retry_after: float = None
+    ):
+        super().__init__(output_message, message_list)
+        if not message_list:
+            self.message_list = [output_message]
+        if retry_after is not None:
+            self.headers = {"Retry-After": str(math.ceil(retry_after))}
+
+
 class ValidationError(ApiException):
     status_code = 422
     error_code = "Validation Error"
@@ -7,9 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi_csrf_protect import CsrfProtect
 from fastapi_csrf_protect.exceptions import CsrfProtectError
 
+from database import engine
+from middlewares import CompressionMiddleware, SqlTimingMiddleware, instrument_engine
 from schemas.auth import CsrfSettings
-from routers import admin_router, post_router, tag_router
-from utils.env import API_TITLE, API_VERSION, API_PREFIX, CORS_ORIGIN_WHITELIST
+from services import auth_service
+from routers import admin_router, post_router, tag_router, metrics_router
+from utils.env import API_TITLE, API_VERSION, API_PREFIX, CORS_ORIGIN_WHITELIST, JWT_REVOCATION_SYNC_SECONDS, \
+    COMPRESSION_MIN_SIZE
 from exceptions import ApiException
 
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +27,8 @@ app.include_router(
     post_router, prefix=API_PREFIX, tags=["posts"])
 app.include_router(
     tag_router, prefix=API_PREFIX, tags=["tags"])
+app.include_router(
+    metrics_router, prefix=API_PREFIX, tags=["metrics"])
 
 origins = CORS_ORIGIN_WHITELIST
 app.add_middleware(
@@ -33,6 +39,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+instrument_engine(engine)
+app.add_middleware(SqlTimingMiddleware)
+# Added last so it wraps everything else and compresses the final body
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
+
+@app.on_event("startup")
+async def start_revocation_sync():
+    auth_service.revocation_store.start(JWT_REVOCATION_SYNC_SECONDS)
+
+
+@app.on_event("shutdown")
+async def stop_revocation_sync():
+    await auth_service.revocation_store.stop()
+
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    auth_service.hashing_pool.shutdown()
+
 
 @CsrfProtect.load_config
 def get_csrf_config():
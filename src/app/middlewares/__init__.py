@@ -0,0 +1,2 @@
+from .compression import CompressionMiddleware
+from .sql_timing import SqlTimingMiddleware, instrument_engine
@@ -0,0 +1,59 @@
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.compression import negotiate_encoding, is_compressible, compress
+
+
+class CompressionMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware, so raw headers such as repeated Set-Cookie pass through untouched
+
+    def __init__(self, app: ASGIApp, minimum_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                # Precompressed bodies (see conditional_response) and other content types pass through as-is
+                if is_compressible(headers.get("content-type")) and "content-encoding" not in headers:
+                    start_message = message
+                    return
+                await send(message)
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            # BaseHTTPMiddleware (SqlTimingMiddleware) streams every body in chunks, so the body is buffered first
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = MutableHeaders(raw=start_message["headers"])
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
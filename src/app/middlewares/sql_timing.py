@@ -0,0 +1,106 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from utils.env import SLOW_QUERY_MS, SQL_N_PLUS_ONE_DETECTION, SQL_N_PLUS_ONE_THRESHOLD
+from utils.logger import setup_logger
+
+logger = setup_logger(modname=__name__)
+
+
+class RequestSqlStats:
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statement_counts = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if SQL_N_PLUS_ONE_DETECTION:
+            self.statement_counts[statement] += 1
+
+
+_request_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+
+    stats = _request_sql_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning({
+            "action": "slow query",
+            "duration_ms": round(seconds * 1000, 2),
+            "statement": statement
+        })
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute, so its start time is dropped here
+    conn = exception_context.connection
+    if conn is None or not conn.info.get("query_started_at"):
+        return
+
+    seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+    stats = _request_sql_stats.get()
+    if stats is not None:
+        stats.record(exception_context.statement, seconds)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # Statements run inside the request's context (SQLAlchemy's greenlets share it),
+    # so the listeners can attribute every statement to the current request
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class SqlTimingMiddleware(BaseHTTPMiddleware):
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        stats = RequestSqlStats()
+        token = _request_sql_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_sql_stats.reset(token)
+
+        server_timing = f'db;dur={stats.total_seconds * 1000:.2f};desc="{stats.count} queries"'
+        if stats.count:
+            server_timing += f', db-slowest;dur={stats.slowest_seconds * 1000:.2f}'
+        if "server-timing" in response.headers:
+            server_timing = f'{response.headers["server-timing"]}, {server_timing}'
+        response.headers["Server-Timing"] = server_timing
+
+        if SQL_N_PLUS_ONE_DETECTION:
+            for statement, count in stats.statement_counts.items():
+                if count > SQL_N_PLUS_ONE_THRESHOLD:
+                    logger.warning({
+                        "action": "possible N+1 query",
+                        "path": request.url.path,
+                        "count": count,
+                        "statement": statement
+                    })
+
+        return response
@@ -1,4 +1,5 @@
 from database import Base
 
 from .admin import Admin
+from .auth import RevokedToken
 from .post import Tag, Post
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+
+from database import Base
+from .mixins import TimestampMixin
+
+
+class RevokedToken(Base, TimestampMixin):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(36), primary_key=True)
+    # UTC time of the token's exp claim; rows past it are purged
+    expires_at = Column(DateTime, nullable=False, index=True)
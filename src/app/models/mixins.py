@@ -1,7 +1,39 @@
-from sqlalchemy import Column, text
-from sqlalchemy.dialects.mysql import TIMESTAMP as Timestamp
+from sqlalchemy import Column, DateTime, text
+from sqlalchemy.dialects.mysql import TIMESTAMP
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# SQLite stores current_timestamp as "YYYY-MM-DD HH:MM:SS". Bound and assigned datetimes use the same text format,
+# otherwise they compare as different strings ("... 00:00:00" < "... 00:00:00.000000") even when they are equal.
+Timestamp = TIMESTAMP().with_variant(
+    SQLITE_DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"), "sqlite"
+)
+# updated_at versions the rows for ETags and keyset cursors, so it keeps microseconds: two writes within one second
+# still leave different values. SQLite's default storage format already has the six digits.
+PreciseTimestamp = TIMESTAMP(fsp=6).with_variant(SQLITE_DATETIME(), "sqlite")
+
+
+class current_timestamp_precise(FunctionElement):
+    type = DateTime()
+    name = "current_timestamp_precise"
+    inherit_cache = True
+
+
+@compiles(current_timestamp_precise)
+def _compile_current_timestamp_precise(element, compiler, **kw):
+    return "current_timestamp(6)"
+
+
+@compiles(current_timestamp_precise, "sqlite")
+def _compile_current_timestamp_precise_sqlite(element, compiler, **kw):
+    # strftime has milliseconds only; padded to the six digits PreciseTimestamp stores
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
 
 
 class TimestampMixin:
     created_at = Column(Timestamp, nullable=False, server_default=text("current_timestamp"))
-    updated_at = Column(Timestamp, nullable=False, server_default=text("current_timestamp on update current_timestamp"))
+    # MariaDB also bumps updated_at with "on update current_timestamp(6)" (see migrations);
+    # onupdate keeps other backends such as SQLite consistent for ORM updates
+    updated_at = Column(PreciseTimestamp, nullable=False, server_default=current_timestamp_precise(),
+                        onupdate=current_timestamp_precise())
@@ -1,7 +1,7 @@
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, ForeignKey, Table
+from sqlalchemy import DDL, Column, String, Boolean, ForeignKey, Index, Table, Text, event
 from sqlalchemy.dialects.mysql import MEDIUMTEXT
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy_utils import UUIDType
 
 from .mixins import TimestampMixin
@@ -11,8 +11,10 @@ from database import Base
 tag_post_map_table = Table(
     "tag_post_map",
     Base.metadata,
-    Column("tag_id", UUIDType(binary=False), ForeignKey("tags.id", ondelete="CASCADE")),
-    Column("post_id", UUIDType(binary=False), ForeignKey("posts.id", ondelete="CASCADE"))
+    Column("tag_id", UUIDType(binary=False), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("post_id", UUIDType(binary=False), ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key serves tag -> posts lookups, this one post -> tags
+    Index("ix_tag_post_map_post_id_tag_id", "post_id", "tag_id")
 )
 
 
@@ -27,13 +29,42 @@ class Tag(Base, TimestampMixin):
 
 class Post(Base, TimestampMixin):
     __tablename__ = "posts"
+    # Both match the keyset order (updated_at, id) of the public and per-author post lists
+    __table_args__ = (
+        Index("ix_posts_is_public_updated_at_id", "is_public", "updated_at", "id"),
+        Index("ix_posts_author_id_updated_at_id", "author_id", "updated_at", "id"),
+    )
 
     id = Column(UUIDType(binary=False), primary_key=True, default=uuid4)
     title = Column(String(200), nullable=False)
     url_slug = Column(String(200), nullable=True, unique=True)
     thumbnail = Column(String(200), nullable=True)
-    description = Column(MEDIUMTEXT, nullable=True)
-    content = Column(MEDIUMTEXT, nullable=False)
+    # The bodies are only loaded for single post responses, never for post lists
+    description = deferred(Column(Text().with_variant(MEDIUMTEXT, "mysql"), nullable=True), group="body")
+    content = deferred(Column(Text().with_variant(MEDIUMTEXT, "mysql"), nullable=False), group="body")
     is_public = Column(Boolean, default=False, nullable=False)
     author_id = Column(UUIDType(binary=False), ForeignKey("admins.id", ondelete="CASCADE"), nullable=True)
     tags = relationship("Tag", secondary=tag_post_map_table, back_populates="posts")
+
+
+# MariaDB searches posts through a FULLTEXT index created by migration (see SearchCrud).
+# SQLite local runs get an FTS5 index over the same columns instead, kept in sync with the posts table by triggers.
+# It keeps its own copy of the text keyed by post_id: posts has no INTEGER PRIMARY KEY, so its rowids are not stable
+# (VACUUM may renumber them) and cannot serve as an external content key.
+# The copied content drops the control characters SearchCrud's snippet() uses as highlight markers.
+POSTS_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE posts_fts USING fts5(post_id UNINDEXED, title, description, content)",
+    "CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts (post_id, title, description, content) "
+    "VALUES (new.id, new.title, new.description, replace(replace(new.content, char(2), ''), char(3), '')); END",
+    "CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts BEGIN "
+    "DELETE FROM posts_fts WHERE post_id = old.id; END",
+    "CREATE TRIGGER posts_fts_update AFTER UPDATE ON posts BEGIN "
+    "DELETE FROM posts_fts WHERE post_id = old.id; "
+    "INSERT INTO posts_fts (post_id, title, description, content) "
+    "VALUES (new.id, new.title, new.description, replace(replace(new.content, char(2), ''), char(3), '')); END",
+)
+
+for statement in POSTS_FTS_SQLITE_DDL:
+    event.listen(Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Post.__table__, "before_drop", DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"))
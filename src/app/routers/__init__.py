@@ -1,3 +1,4 @@
 from routers.admin import router as admin_router
 from routers.post import router as post_router
 from routers.tag import router as tag_router
+from routers.metrics import router as metrics_router
@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status, Response, Request
@@ -5,36 +6,40 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi_csrf_protect import CsrfProtect
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas import admin_schema, auth_schema, ResponseMsg
-from models import Admin
-from cruds import admin_crud
+from cruds import admin_crud, post_crud, revoked_token_crud
 from database import get_db
-from services import auth_service
+from services import auth_service, login_ip_limiter, login_account_limiter
+from services.rate_limit import rate_limit
 from utils.env import API_PREFIX
 
 from exceptions import error_responses, AlreadyRegisteredError, JwtExpiredSignatureError, UnauthorizedAdminError, \
-    ObjectNotFoundError, jwt_errors_list, csrf_errors_list, ValidationError
+    ObjectNotFoundError, jwt_errors_list, csrf_errors_list, ValidationError, TooManyRequestsError
 
 router = APIRouter(prefix="/admin")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{API_PREFIX}/admin/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{API_PREFIX}/admin/token", auto_error=False)
+
+# Credential endpoints share buckets per client IP and per account email
+login_rate_limit = rate_limit(login_ip_limiter, login_account_limiter, account_field="username")
+create_admin_rate_limit = rate_limit(login_ip_limiter)
+reset_password_rate_limit = rate_limit(login_ip_limiter, login_account_limiter, account_field="email")
 
 
 async def get_current_admin(
         token: str = Depends(oauth2_scheme),
-        db: Session = Depends(get_db)
-) -> Admin:
+        db: AsyncSession = Depends(get_db)
+) -> admin_schema.AdminInDB:
 
     admin_id = auth_service.decode_jwt(token)
-    db_admin = admin_crud.get_admin_by_id(admin_id, db)
-
-    return db_admin
+    return await admin_crud.get_principal(admin_id, db)
 
 
 async def get_current_active_admin(
-        current_admin: admin_schema.Admin = Depends(get_current_admin)
-) -> Admin:
+        current_admin: admin_schema.AdminInDB = Depends(get_current_admin)
+) -> admin_schema.AdminInDB:
     if not current_admin:
         raise ObjectNotFoundError(output_message="The admin user was not found")
 
@@ -56,21 +61,22 @@ def get_csrf_token(csrf_protect: CsrfProtect = Depends()):
 @router.post("/create",
              status_code=status.HTTP_201_CREATED,
              response_model=admin_schema.Admin,
+             dependencies=[Depends(create_admin_rate_limit)],
              responses={
                  201: {"description": "Temporary Admin Created"},
                  **error_responses([
                      AlreadyRegisteredError(message_list=["The Email has already registered"]),
-                     *csrf_errors_list, ValidationError()])})
+                     TooManyRequestsError(), *csrf_errors_list, ValidationError()])})
 async def create_admin_temporary(
         new_admin: admin_schema.AdminCreate,
         request: Request,
         csrf_protect: CsrfProtect = Depends(),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    if admin_crud.get_admin_by_email(new_admin.email, db):
+    if await admin_crud.get_admin_by_email(new_admin.email, db):
         raise AlreadyRegisteredError(output_message="The Email has already registered")
-    return admin_crud.create_admin(new_admin, db)
+    return await admin_crud.create_admin(new_admin, db)
 
 
 @router.post("/verify-email/{admin_id}",
@@ -85,35 +91,42 @@ async def verify_email_and_register_admin(
         admin_id: UUID,
         request: Request,
         csrf_protect: CsrfProtect = Depends(),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    db_admin = admin_crud.get_admin_by_id(admin_id, db)
+    db_admin = await admin_crud.get_admin_by_id(admin_id, db)
     if not db_admin:
         raise ObjectNotFoundError(output_message="The admin user was not found by request ID")
-    return admin_crud.activate_admin(db_admin, db)
+    return await admin_crud.activate_admin(db_admin, db)
 
 
 @router.post("/token",
              status_code=status.HTTP_201_CREATED,
              response_model=auth_schema.Token,
+             dependencies=[Depends(login_rate_limit)],
              responses={
                  201: {"description": "Access Token Created"},
                  **error_responses([
                      UnauthorizedAdminError(message_list=["Incorrect email or password"]),
-                     ValidationError(), *csrf_errors_list])})
+                     TooManyRequestsError(), ValidationError(), *csrf_errors_list])})
 async def login_for_access_token(
         response: Response,
         request: Request,
         csrf_protect: CsrfProtect = Depends(),
         form_data: OAuth2PasswordRequestForm = Depends(),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    db_admin = admin_crud.get_admin_by_email(form_data.username, db)
-    if not db_admin or not auth_service.verify_password(form_data.password, db_admin.hashed_password):
+    db_admin = await admin_crud.get_admin_by_email(form_data.username, db)
+    if not db_admin:
         raise UnauthorizedAdminError(output_message="Incorrect email or password")
 
+    verified, new_hash = await auth_service.verify_and_update_password(form_data.password, db_admin.hashed_password)
+    if not verified:
+        raise UnauthorizedAdminError(output_message="Incorrect email or password")
+    if new_hash:
+        await admin_crud.update_password_hash(new_hash, db_admin, db)
+
     access_token = auth_service.create_access_token({"sub": jsonable_encoder(db_admin.id)})
     response.set_cookie(key="access_token", value=f"Bearer {access_token}", httponly=True)
     return {"access_token": access_token, "token_type": "bearer"}
@@ -125,8 +138,25 @@ async def login_for_access_token(
              responses={
                  200: {"description": "Delete Cookie Requested"},
                  **error_responses([*csrf_errors_list])})
-async def logout(response: Response, request: Request, csrf_protect: CsrfProtect = Depends()):
+async def logout(
+        response: Response,
+        request: Request,
+        csrf_protect: CsrfProtect = Depends(),
+        token: Optional[str] = Depends(optional_oauth2_scheme),
+        db: AsyncSession = Depends(get_db)
+):
     auth_service.verify_csrf(request, csrf_protect)
+    cookie = request.cookies.get("access_token", "")
+    token = token or (cookie[len("Bearer "):] if cookie.startswith("Bearer ") else None)
+    if token:
+        try:
+            claims = auth_service.decode_claims(token)
+        except (JwtExpiredSignatureError, UnauthorizedAdminError):
+            # Expired, invalid or already revoked tokens can no longer be used anyway
+            claims = None
+        if claims and claims.get("jti"):
+            await revoked_token_crud.create_revoked_token(claims["jti"], claims["exp"], db)
+
     response.delete_cookie(key="access_token")
     return {"message": "Successfully logged-out"}
 
@@ -141,9 +171,14 @@ async def logout(response: Response, request: Request, csrf_protect: CsrfProtect
                     ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"])
                 ])
             })
-async def get_admin(response: Response, current_admin: Admin = Depends(get_current_active_admin)):
+async def get_admin(
+        response: Response,
+        current_admin: admin_schema.AdminInDB = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
+):
     auth_service.update_jwt(current_admin.id, response)
-    return current_admin
+    posts = await post_crud.get_my_posts(current_admin.id, db)
+    return admin_schema.AdminWithPosts(**current_admin.dict(exclude={"hashed_password"}), posts=posts)
 
 
 @router.put("/update",
@@ -160,12 +195,13 @@ async def update_admin(
         request: Request,
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
-        current_admin: Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        current_admin: admin_schema.AdminInDB = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    return admin_crud.update_admin(current_admin, new_data, db)
+    db_admin = await admin_crud.get_admin_by_id(current_admin.id, db)
+    return await admin_crud.update_admin(db_admin, new_data, db)
 
 
 @router.put("/update-password",
@@ -184,14 +220,15 @@ async def update_password_admin(
         request: Request,
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
-        current_admin: Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        current_admin: admin_schema.AdminInDB = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    if not auth_service.verify_password(password_data.current_password, current_admin.hashed_password):
+    if not await auth_service.verify_password(password_data.current_password, current_admin.hashed_password):
         raise UnauthorizedAdminError(output_message="Incorrect current password")
     auth_service.update_jwt(current_admin.id, response)
-    if admin_crud.update_password(password_data.password, current_admin, db):
+    db_admin = await admin_crud.get_admin_by_id(current_admin.id, db)
+    if await admin_crud.update_password(password_data.password, db_admin, db):
         return {"message": "Successfully updated password"}
     else:
         return {"message": "Failed updated password"}
@@ -200,22 +237,23 @@ async def update_password_admin(
 @router.put("/reset-password",
             status_code=status.HTTP_200_OK,
             response_model=ResponseMsg,
+            dependencies=[Depends(reset_password_rate_limit)],
             responses={
                 200: {"description": "Admin Password Reset"},
                 **error_responses([
                     ObjectNotFoundError(message_list=["The admin was not found. The Email is incorrect or does not register"]),
-                    *csrf_errors_list])})
+                    TooManyRequestsError(), *csrf_errors_list])})
 async def reset_password_admin(
         new_admin: admin_schema.AdminCreate,
         request: Request,
         csrf_protect: CsrfProtect = Depends(),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    db_admin = admin_crud.get_admin_by_email(new_admin.email, db)
+    db_admin = await admin_crud.get_admin_by_email(new_admin.email, db)
     if not db_admin:
         raise ObjectNotFoundError(output_message="The admin was not found. The Email is incorrect or does not register")
-    if admin_crud.update_password(new_admin.password, db_admin, db):
+    if await admin_crud.update_password(new_admin.password, db_admin, db):
         return {"message": "Successfully updated password"}
     else:
         return {"message": "Failed updated password"}
@@ -235,11 +273,11 @@ async def reset_password_admin(
 async def delete_admin(
         request: Request,
         csrf_protect: CsrfProtect = Depends(),
-        current_admin: Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        current_admin: admin_schema.AdminInDB = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
-    if admin_crud.delete_admin(current_admin, db):
+    if await admin_crud.delete_admin(current_admin.id, db):
         return {"message": "Successfully Admin Deleted"}
     else:
         return {"message": "Failed admin deleted"}
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, status, Response
+
+from database import get_pool_stats
+from schemas import admin_schema, metrics_schema
+from services import auth_service, response_cache, principal_cache, fragment_cache
+from .admin import get_current_active_admin
+
+from exceptions import error_responses, ObjectNotFoundError, jwt_errors_list
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/cache",
+            status_code=status.HTTP_200_OK,
+            response_model=metrics_schema.CacheStats,
+            responses={
+                200: {"description": "Response Cache Metrics Requested"},
+                **error_responses([
+                    ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    *jwt_errors_list
+                ])
+            })
+async def get_cache_metrics(
+        response: Response,
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin)
+):
+    auth_service.update_jwt(current_admin.id, response)
+    return response_cache.stats()
+
+
+@router.get("/fragments",
+            status_code=status.HTTP_200_OK,
+            response_model=metrics_schema.FragmentCacheStats,
+            responses={
+                200: {"description": "Post Fragment Cache Metrics Requested"},
+                **error_responses([
+                    ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    *jwt_errors_list
+                ])
+            })
+async def get_fragment_cache_metrics(
+        response: Response,
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin)
+):
+    auth_service.update_jwt(current_admin.id, response)
+    return fragment_cache.stats()
+
+
+@router.get("/principals",
+            status_code=status.HTTP_200_OK,
+            response_model=metrics_schema.CacheStats,
+            responses={
+                200: {"description": "Principal Cache Metrics Requested"},
+                **error_responses([
+                    ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    *jwt_errors_list
+                ])
+            })
+async def get_principal_cache_metrics(
+        response: Response,
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin)
+):
+    auth_service.update_jwt(current_admin.id, response)
+    return principal_cache.stats()
+
+
+@router.get("/pool",
+            status_code=status.HTTP_200_OK,
+            response_model=metrics_schema.PoolStats,
+            responses={
+                200: {"description": "Connection Pool Metrics Requested"},
+                **error_responses([
+                    ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    *jwt_errors_list
+                ])
+            })
+async def get_pool_metrics(
+        response: Response,
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin)
+):
+    auth_service.update_jwt(current_admin.id, response)
+    return get_pool_stats()
+
+
+@router.get("/hashing",
+            status_code=status.HTTP_200_OK,
+            response_model=metrics_schema.HashingStats,
+            responses={
+                200: {"description": "Password Hashing Pool Metrics Requested"},
+                **error_responses([
+                    ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    *jwt_errors_list
+                ])
+            })
+async def get_hashing_metrics(
+        response: Response,
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin)
+):
+    auth_service.update_jwt(current_admin.id, response)
+    return auth_service.hashing_pool.stats()
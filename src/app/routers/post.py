@@ -1,49 +1,118 @@
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, status, Depends, Request, Response
+from fastapi import APIRouter, status, Depends, Request, Response, Query
 from fastapi_csrf_protect import CsrfProtect
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from schemas import post_schema, admin_schema, ResponseMsg
-from cruds import post_crud
-from cruds.domain import MapPostAndTags
-from services import auth_service
+from cruds import post_crud, tag_crud, public_read_crud, search_crud
+from services import auth_service, response_cache, fragment_cache
+from services.cache import POST_LIST, post_label, tag_label, render_json, extend_json
+from services.conditional import CachedResponse, make_etag, is_not_modified, not_modified_response, \
+    conditional_response
+from utils.env import POST_PAGE_SIZE, POST_PAGE_SIZE_MAX, SEARCH_QUERY_MAX_LENGTH
 from .admin import get_current_active_admin
-from exceptions import error_responses, ObjectNotFoundError, AlreadyRegisteredError, jwt_errors_list, csrf_errors_list
+from exceptions import error_responses, ObjectNotFoundError, AlreadyRegisteredError, BadRequestError, \
+    jwt_errors_list, csrf_errors_list
 
 router = APIRouter(prefix="/posts")
 
 
 @router.get("",
             status_code=status.HTTP_200_OK,
-            response_model=List[post_schema.Post],
+            response_model=Union[List[post_schema.PostSummary], post_schema.PostPage],
             responses={
                 200: {"description": "My Posts Requested"},
                 **error_responses([
                     ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
+                    BadRequestError(message_list=["The cursor is invalid"]),
                     *jwt_errors_list
                 ])
             })
 async def get_my_posts(
         response: Response,
+        limit: Optional[int] = Query(None, ge=1, le=POST_PAGE_SIZE_MAX),
+        cursor: Optional[str] = None,
         current_admin: admin_schema.Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.update_jwt(current_admin.id, response)
-    posts = post_crud.get_my_posts(current_admin.id, db)
-    return posts
+    if limit is None and cursor is None:
+        return await post_crud.get_my_posts(current_admin.id, db)
+
+    posts, next_cursor = await post_crud.get_my_posts_page(current_admin.id, limit or POST_PAGE_SIZE, cursor, db)
+    return {"items": posts, "next_cursor": next_cursor}
 
 
 @router.get("/public",
             status_code=status.HTTP_200_OK,
-            response_model=List[post_schema.PostPublic],
-            responses={200: {"description": "Public Posts Requested"}})
-async def get_public_posts(db: Session = Depends(get_db)):
-    posts = post_crud.get_public_posts(db)
-    return posts
+            response_model=Union[List[post_schema.PostSummary], post_schema.PostPage],
+            responses={
+                200: {"description": "Public Posts Requested"},
+                304: {"description": "Not Modified"},
+                **error_responses([BadRequestError(message_list=["The cursor is invalid"])])
+            })
+async def get_public_posts(
+        request: Request,
+        limit: Optional[int] = Query(None, ge=1, le=POST_PAGE_SIZE_MAX),
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    cache_key = response_cache.key(request)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation()
+        fragment_generation = fragment_cache.generation()
+        posts_version = await post_crud.get_public_posts_version(db)
+        tags_version = await tag_crud.get_public_post_tags_version(db)
+        etag = make_etag(cache_key, (*posts_version, *tags_version))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        if limit is None and cursor is None:
+            posts = await public_read_crud.get_public_posts(db)
+            body = fragment_cache.render_posts(post_schema.PostSummary, posts, fragment_generation)
+        else:
+            posts, next_cursor = await public_read_crud.get_public_posts_page(limit or POST_PAGE_SIZE, cursor, db)
+            body = extend_json(
+                b"{}",
+                items=fragment_cache.render_posts(post_schema.PostSummary, posts, fragment_generation),
+                next_cursor=render_json(Optional[str], next_cursor)
+            )
+        cached = CachedResponse(body, etag)
+        response_cache.set(cache_key, cached, depends_on=[POST_LIST], since=generation)
+
+    return conditional_response(request, cached)
+
+
+# Declared before "/{post_slug}", which would otherwise capture "search" as a slug
+@router.get("/search",
+            status_code=status.HTTP_200_OK,
+            response_model=post_schema.PostSearchPage,
+            responses={
+                200: {"description": "Public Posts Searched"},
+                304: {"description": "Not Modified"}
+            })
+async def search_public_posts(
+        request: Request,
+        q: str = Query(..., min_length=1, max_length=SEARCH_QUERY_MAX_LENGTH),
+        limit: int = Query(POST_PAGE_SIZE, ge=1, le=POST_PAGE_SIZE_MAX),
+        offset: int = Query(0, ge=0),
+        db: AsyncSession = Depends(get_db)
+):
+    # Not kept in response_cache: every distinct q would be an entry, evicting the hot list and detail responses
+    posts_version = await post_crud.get_public_posts_version(db)
+    tags_version = await tag_crud.get_public_post_tags_version(db)
+    etag = make_etag(response_cache.key(request), (*posts_version, *tags_version))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    posts, next_offset = await search_crud.search_public_posts(q, limit, offset, db)
+    body = render_json(post_schema.PostSearchPage, {"items": posts, "next_offset": next_offset})
+    return conditional_response(request, CachedResponse(body, etag))
 
 
 @router.get("/{post_slug}",
@@ -51,13 +120,32 @@ async def get_public_posts(db: Session = Depends(get_db)):
             response_model=post_schema.Post,
             responses={
                 200: {"description": "The Post Requested"},
+                304: {"description": "Not Modified"},
                 **error_responses([ObjectNotFoundError(message_list=["The post was not found by ID"])])
             })
-async def get_public_post_by_slug(post_slug: str, db: Session = Depends(get_db)):
-    post = post_crud.get_public_post_by_slug(post_slug, db)
-    if not post:
-        raise ObjectNotFoundError(output_message="The post was not found by slug")
-    return post
+async def get_public_post_by_slug(post_slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    cache_key = response_cache.key(request)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation()
+        fragment_generation = fragment_cache.generation()
+        version = await post_crud.get_public_post_version(post_slug, db)
+        if not version:
+            raise ObjectNotFoundError(output_message="The post was not found by slug")
+        etag = make_etag(cache_key, version)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        post = await post_crud.get_public_post_by_slug(post_slug, db)
+        if not post:
+            raise ObjectNotFoundError(output_message="The post was not found by slug")
+        cached = CachedResponse(fragment_cache.render_post(post_schema.Post, post, fragment_generation), etag)
+        response_cache.set(
+            cache_key, cached, depends_on=[post_label(post.id), *[tag_label(tag.id) for tag in post.tags]],
+            since=generation
+        )
+
+    return conditional_response(request, cached)
 
 
 @router.post("/create",
@@ -81,15 +169,11 @@ async def create_post(
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
         current_admin: admin_schema.Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    db_post = post_crud.create_post(current_admin.id, post_data, db)
-    if tag_ids:
-        map_post_tags = MapPostAndTags()
-        db_post = map_post_tags.create_map(tag_ids, db_post, db)
-    return db_post
+    return await post_crud.create_post(current_admin.id, post_data, tag_ids, db)
 
 
 @router.put("/{post_id}",
@@ -100,7 +184,7 @@ async def create_post(
                 **error_responses([
                     *jwt_errors_list,
                     *csrf_errors_list,
-                    AlreadyRegisteredError(message_list=["The post was not found by ID"]),
+                    AlreadyRegisteredError(message_list=["The url-slug has already registered"]),
                     ObjectNotFoundError(message_list=[
                         "The post was not found by ID",
                         "The tag was not found by ID",
@@ -115,23 +199,16 @@ async def update_post(
         request: Request,
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
-        current_admin: admin_schema.AdminWithPosts = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    posts = current_admin.posts
-    db_post = [post for post in posts if post.id == post_id]
+    db_post = await post_crud.get_owned_post(post_id, current_admin.id, db)
     if not db_post:
         raise ObjectNotFoundError(output_message="The post was not found by ID")
-    db_post = post_crud.update_post(db_post[0], post_data, db)
-
-    map_post_tags = MapPostAndTags()
-    if tag_ids and not db_post.tags:
-        db_post = map_post_tags.create_map(tag_ids, db_post, db)
-    elif tag_ids:
-        db_post = map_post_tags.update_map(tag_ids, db_post, db)
-    return db_post
+    # An empty tag list leaves the post's tags untouched
+    return await post_crud.update_post(db_post, post_data, tag_ids or None, db)
 
 
 @router.delete("/{post_id}",
@@ -152,19 +229,16 @@ async def delete_post(
         request: Request,
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
-        current_admin: admin_schema.AdminWithPosts = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        current_admin: admin_schema.Admin = Depends(get_current_active_admin),
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    posts = current_admin.posts
-    db_post = [post for post in posts if post.id == post_id]
+    db_post = await post_crud.get_owned_post(post_id, current_admin.id, db)
     if not db_post:
         raise ObjectNotFoundError(output_message="The post was not found by ID")
 
-    post_crud.delete_post(db_post[0], db)
-
-    if not post_crud.get_post(post_id, db):
+    if await post_crud.delete_post(db_post, db):
         return {"message": "Successfully Post Deleted"}
     else:
         return {"message": "Failed delete"}
@@ -4,12 +4,15 @@ from typing import List, Union
 from fastapi import APIRouter, Depends, status, Request, Response
 from fastapi_csrf_protect import CsrfProtect
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas import tag_schema, admin_schema, post_schema, ResponseMsg
-from cruds import tag_crud
+from cruds import tag_crud, public_read_crud
 from database import get_db
-from services import auth_service
+from services import auth_service, response_cache, fragment_cache
+from services.cache import TAG_LIST, tag_label, tag_posts_label, render_json, extend_json
+from services.conditional import CachedResponse, make_etag, is_not_modified, not_modified_response, \
+    conditional_response
 from .admin import get_current_active_admin
 
 from exceptions import error_responses, ObjectNotFoundError, AlreadyRegisteredError, jwt_errors_list, \
@@ -21,13 +24,28 @@ router = APIRouter(prefix="/tags")
 @router.get("",
             status_code=status.HTTP_200_OK,
             response_model=Union[List[tag_schema.Tag], ResponseMsg],
-            responses={200: {"description": "All Tags Requested"}})
-async def get_tags(db: Session = Depends(get_db)):
-    tags = tag_crud.get_tags(db)
-    if not tags:
-        return {"message": "No registered tags"}
-
-    return tags
+            responses={
+                200: {"description": "All Tags Requested"},
+                304: {"description": "Not Modified"}
+            })
+async def get_tags(request: Request, db: AsyncSession = Depends(get_db)):
+    cache_key = response_cache.key(request)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation()
+        etag = make_etag(cache_key, await tag_crud.get_tags_version(db))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        tags = await tag_crud.get_tags(db)
+        if not tags:
+            body = render_json(ResponseMsg, {"message": "No registered tags"})
+        else:
+            body = render_json(List[tag_schema.Tag], tags)
+        cached = CachedResponse(body, etag)
+        response_cache.set(cache_key, cached, depends_on=[TAG_LIST], since=generation)
+
+    return conditional_response(request, cached)
 
 
 @router.get("/{tag_slug}",
@@ -35,17 +53,40 @@ async def get_tags(db: Session = Depends(get_db)):
             response_model=post_schema.TagWithPosts,
             responses={
                 200: {"description": "Tag requested by ID"},
+                304: {"description": "Not Modified"},
                 **error_responses([
                     ObjectNotFoundError(message_list=["The tag was not found by ID"]),
                     ValidationError()
                 ])
             })
-async def get_tag_with_posts(tag_slug: str, db: Session = Depends(get_db)):
-    tag = tag_crud.get_tag_by_slug(tag_slug, db)
-    if not tag:
-        raise ObjectNotFoundError(output_message="The tag was not found by the slug")
-
-    return tag
+async def get_tag_with_posts(tag_slug: str, request: Request, db: AsyncSession = Depends(get_db)):
+    cache_key = response_cache.key(request)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        generation = response_cache.generation()
+        fragment_generation = fragment_cache.generation()
+        version = await tag_crud.get_tag_version(tag_slug, db)
+        if not version:
+            raise ObjectNotFoundError(output_message="The tag was not found by the slug")
+        tags_version = await tag_crud.get_public_post_tags_version(db)
+        etag = make_etag(cache_key, (*version, *tags_version))
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        tag = await public_read_crud.get_tag_with_posts(tag_slug, db)
+        if not tag:
+            raise ObjectNotFoundError(output_message="The tag was not found by the slug")
+        body = extend_json(
+            render_json(tag_schema.Tag, tag),
+            posts=fragment_cache.render_posts(post_schema.PostSummary, tag.posts, fragment_generation)
+        )
+        cached = CachedResponse(body, etag)
+        embedded_tag_ids = {post_tag.id for post in tag.posts for post_tag in post.tags}
+        response_cache.set(cache_key, cached, depends_on=[
+            tag_label(tag.id), tag_posts_label(tag.id), *[tag_label(tag_id) for tag_id in embedded_tag_ids]
+        ], since=generation)
+
+    return conditional_response(request, cached)
 
 
 @router.post("/create",
@@ -54,7 +95,8 @@ async def get_tag_with_posts(tag_slug: str, db: Session = Depends(get_db)):
              responses={
                  201: {"description": "Tag Created"},
                  **error_responses([
-                     AlreadyRegisteredError(message_list=["The Tag already registered"]),
+                     AlreadyRegisteredError(message_list=[
+                         "The Tag already registered", "The Tag slug already registered"]),
                      ObjectNotFoundError(message_list=["The admin user was not found", "The admin user is not active"]),
                      *jwt_errors_list, *csrf_errors_list
                  ])
@@ -65,20 +107,21 @@ async def create_tag(
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
         current_admin: admin_schema.Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    if tag_crud.get_tag_by_title(new_tag.title, db):
+    if await tag_crud.get_tag_by_title(new_tag.title, db):
         raise AlreadyRegisteredError(output_message="The Tag already registered")
-    return tag_crud.create_tag(new_tag, db)
+    return await tag_crud.create_tag(new_tag, db)
 
 
 @router.put("/{tag_id}", status_code=status.HTTP_200_OK, response_model=tag_schema.Tag,
             responses={
                 200: {"description": "Tag Updated"},
                 **error_responses([
-                    AlreadyRegisteredError(message_list=["The Tag already registered"]),
+                    AlreadyRegisteredError(message_list=[
+                        "The Tag already registered", "The Tag slug already registered"]),
                     ObjectNotFoundError(message_list=[
                         "The Tag was not found by ID",
                         "The admin user was not found",
@@ -93,14 +136,15 @@ async def update_tag(
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
         current_admin: admin_schema.Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    if tag_crud.get_tag_by_title(new_tag.title, db):
+    db_tag = await tag_crud.get_tag_by_title(new_tag.title, db) if new_tag.title else None
+    if db_tag and db_tag.id != tag_id:
         raise AlreadyRegisteredError(output_message="The Tag already registered")
 
-    return tag_crud.update_tag(tag_id, new_tag, db)
+    return await tag_crud.update_tag(tag_id, new_tag, db)
 
 
 @router.delete("/{tag_id}",
@@ -123,11 +167,11 @@ async def delete_tag(
         response: Response,
         csrf_protect: CsrfProtect = Depends(),
         current_admin: admin_schema.Admin = Depends(get_current_active_admin),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
 ):
     auth_service.verify_csrf(request, csrf_protect)
     auth_service.update_jwt(current_admin.id, response)
-    result = tag_crud.delete_tag(tag_id, db)
+    result = await tag_crud.delete_tag(tag_id, db)
     if result:
         return {"message": "Successfully Tag Deleted"}
     else:
@@ -1,5 +1,6 @@
 import schemas.admin as admin_schema
 import schemas.auth as auth_schema
+import schemas.metrics as metrics_schema
 import schemas.post as post_schema
 import schemas.tag as tag_schema
 from .response import Errors, ResponseMsg
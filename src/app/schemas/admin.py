@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr, constr, validator
 from typing import List, Optional
 from uuid import UUID
-from .post import Post
+from .post import PostSummary
 
 
 class AdminBase(BaseModel):
@@ -45,7 +45,7 @@ class Admin(AdminInDBBase):
 
 
 class AdminWithPosts(AdminInDBBase):
-    posts: List[Post]
+    posts: List[PostSummary]
 
 
 class AdminInDB(AdminInDBBase):
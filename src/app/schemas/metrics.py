@@ -0,0 +1,45 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int = 0
+    stale_sets: int = 0
+
+
+class FragmentCacheStats(CacheStats):
+    size_bytes: int
+    max_bytes: int
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    size: Optional[int]
+    checked_in: Optional[int]
+    checked_out: Optional[int]
+    overflow: Optional[int]
+    max_overflow: Optional[int]
+    checkouts: int
+    checkout_timeouts: int
+    average_wait_ms: float
+    max_wait_ms: float
+
+
+class HashingStats(BaseModel):
+    executor: str
+    max_workers: int
+    in_flight: int
+    queue_depth: int
+    max_queue_depth: int
+    completed: int
+    average_ms: float
+    max_ms: float
+    rebuilds: int
@@ -42,9 +42,38 @@ class PostPublic(Post):
     is_public: bool = True
 
 
+class PostSummary(BaseModel):
+    id: UUID
+    title: str
+    url_slug: Optional[str]
+    thumbnail: Optional[str]
+    is_public: bool
+    created_at: datetime
+    updated_at: datetime
+    tags: Optional[List[Tag]]
+
+    class Config:
+        orm_mode = True
+
+
+class PostPage(BaseModel):
+    items: List[PostSummary]
+    next_cursor: Optional[str]
+
+
+class PostSearchHit(PostSummary):
+    # HTML-escaped excerpt of the content with the matched terms in <mark> tags
+    snippet: str
+
+
+class PostSearchPage(BaseModel):
+    items: List[PostSearchHit]
+    next_offset: Optional[int]
+
+
 class PostInDB(PostInDBBase):
     pass
 
 
 class TagWithPosts(Tag):
-    posts: Optional[List[Post]]
+    posts: Optional[List[PostSummary]]
@@ -1,3 +1,23 @@
 from services.auth import AuthService
+from services.cache import FragmentCache, ResponseCache, TtlLruCache
+from services.rate_limit import TokenBucketLimiter
+from utils.env import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS, \
+    FRAGMENT_CACHE_MAX_ENTRIES, FRAGMENT_CACHE_MAX_BYTES, FRAGMENT_CACHE_TTL_SECONDS, \
+    PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS, RATE_LIMIT_MAX_KEYS, \
+    LOGIN_RATE_LIMIT_IP_BURST, LOGIN_RATE_LIMIT_IP_PER_MINUTE, \
+    LOGIN_RATE_LIMIT_ACCOUNT_BURST, LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE
 
 auth_service = AuthService()
+response_cache = ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS)
+fragment_cache = FragmentCache(
+    max_entries=FRAGMENT_CACHE_MAX_ENTRIES, max_bytes=FRAGMENT_CACHE_MAX_BYTES, ttl_seconds=FRAGMENT_CACHE_TTL_SECONDS
+)
+principal_cache = TtlLruCache(max_entries=PRINCIPAL_CACHE_MAX_ENTRIES, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+login_ip_limiter = TokenBucketLimiter(
+    capacity=LOGIN_RATE_LIMIT_IP_BURST, refill_per_second=LOGIN_RATE_LIMIT_IP_PER_MINUTE / 60,
+    max_keys=RATE_LIMIT_MAX_KEYS
+)
+login_account_limiter = TokenBucketLimiter(
+    capacity=LOGIN_RATE_LIMIT_ACCOUNT_BURST, refill_per_second=LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE / 60,
+    max_keys=RATE_LIMIT_MAX_KEYS
+)
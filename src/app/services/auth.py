@@ -1,5 +1,9 @@
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+import hashlib
+import time
 import uuid
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 
 from fastapi import Request, Response
@@ -7,25 +11,43 @@ from fastapi.encoders import jsonable_encoder
 from fastapi_csrf_protect import CsrfProtect
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
-from utils.env import JWT_SECRET_KEY, JWT_EXPIRE_MINUTES, JWT_NOT_BEFORE_SECONDS, ALGORITHM
+from services.cache import TtlLruCache
+from services.revocation import RevocationStore
+from services.hashing import HashingPool
+from utils.passwords import hash_password, verify_password, verify_and_update
+from utils.env import JWT_SECRET_KEY, JWT_EXPIRE_MINUTES, JWT_NOT_BEFORE_SECONDS, JWT_REFRESH_WINDOW_MINUTES, \
+    JWT_CLAIMS_CACHE_MAX_ENTRIES, ALGORITHM, HASH_WORKERS, HASH_USE_PROCESSES
 from exceptions import JwtExpiredSignatureError, UnauthorizedAdminError
 
+# Claims of the token that authenticated the current request, read back by update_jwt
+_request_claims: ContextVar[Optional[Dict]] = ContextVar("request_claims", default=None)
+
 
 class AuthService:
 
-    pwd_context = CryptContext(schemes=["sha256_crypt"])
+    def __init__(self):
+        # Password hashing is CPU-bound and kept off the event loop
+        self.hashing_pool = HashingPool(max_workers=HASH_WORKERS, use_processes=HASH_USE_PROCESSES)
+        self.revocation_store = RevocationStore()
+        # Verified claims keyed by token digest, each entry living until the token's own exp
+        self.claims_cache = TtlLruCache(
+            max_entries=JWT_CLAIMS_CACHE_MAX_ENTRIES, ttl_seconds=JWT_EXPIRE_MINUTES * 60
+        )
 
     def verify_csrf(self, request: Request, csrf_protect: CsrfProtect) -> None:
         csrf_token = csrf_protect.get_csrf_from_headers(request.headers)
         csrf_protect.validate_csrf(csrf_token)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.hashing_pool.run(verify_password, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+    async def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        # The second value is a fresh hash when the stored one uses an outdated scheme or cost
+        return await self.hashing_pool.run(verify_and_update, plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str) -> str:
+        return await self.hashing_pool.run(hash_password, password)
 
     def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
@@ -38,17 +60,39 @@ class AuthService:
         })
         return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=ALGORITHM)
 
+    def decode_claims(self, token: str) -> Dict:
+        token_digest = hashlib.sha256(token.encode("utf-8")).digest()
+        claims = self.claims_cache.get(token_digest)
+        if claims is None:
+            try:
+                claims = jwt.decode(token, JWT_SECRET_KEY, algorithms=ALGORITHM)
+            except jwt.ExpiredSignatureError:
+                raise JwtExpiredSignatureError()
+            except JWTError:
+                raise UnauthorizedAdminError()
+
+            remaining_seconds = claims.get("exp", 0) - time.time()
+            if remaining_seconds > 0:
+                self.claims_cache.set(token_digest, claims, ttl_seconds=remaining_seconds)
+
+        # Checked on cache hits too, so a revoked token stops working at once in this process
+        if self.revocation_store.is_revoked(claims.get("jti")):
+            raise UnauthorizedAdminError(output_message="The token has been revoked")
+
+        _request_claims.set(claims)
+        return claims
+
     def decode_jwt(self, token: str) -> UUID:
-        try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=ALGORITHM)
-            user_id: UUID = payload.get("sub")
-            return user_id
-        except jwt.ExpiredSignatureError:
-            raise JwtExpiredSignatureError()
-        except JWTError:
-            raise UnauthorizedAdminError()
+        user_id: UUID = self.decode_claims(token).get("sub")
+        return user_id
 
     def update_jwt(self, admin_id: UUID, response: Response) -> None:
+        # Keep the presented token until it enters the refresh window instead of re-signing on every request
+        claims = _request_claims.get()
+        if claims and claims.get("sub") == jsonable_encoder(admin_id):
+            if claims.get("exp", 0) - time.time() > JWT_REFRESH_WINDOW_MINUTES * 60:
+                return
+
         new_token = self.create_access_token({"sub": jsonable_encoder(admin_id)})
         response.set_cookie(
             key="access_token", value=f"Bearer {new_token}", httponly=True
@@ -0,0 +1,245 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+from urllib.parse import urlencode
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from services import fast_json
+from utils.env import FAST_JSON
+
+# Labels that cached responses depend on. A write invalidates every entry carrying one of its labels.
+POST_LIST = "post-list"
+TAG_LIST = "tag-list"
+
+
+def post_label(post_id) -> str:
+    return f"post:{post_id}"
+
+
+def tag_label(tag_id) -> str:
+    return f"tag:{tag_id}"
+
+
+def tag_posts_label(tag_id) -> str:
+    return f"tag-posts:{tag_id}"
+
+
+class TtlLruCache:
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self._set(key, value, ttl_seconds)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if ttl_seconds is None or ttl_seconds > self.ttl_seconds:
+            ttl_seconds = self.ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        del self._entries[key]
+
+
+class ResponseCache(TtlLruCache):
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        super().__init__(max_entries, ttl_seconds)
+        self._keys_by_label: Dict[str, Set[Hashable]] = {}
+        self._labels_by_key: Dict[Hashable, Set[str]] = {}
+        # Every invalidation bumps the generation and stamps its labels with it. Labels of deleted objects are never
+        # invalidated again, so only the most recent max_entries stamps are kept; a forgotten label counts as stamped
+        # with the newest generation dropped, which can only skip a set, never keep a stale one.
+        self._generation = 0
+        self._label_generations: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten_generation = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def key(self, request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def generation(self) -> int:
+        # Taken before reading the data a response is built from, then passed to set()
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, depends_on: Iterable[str] = (), since: Optional[int] = None) -> None:
+        with self._lock:
+            labels = set(depends_on)
+            # A write invalidated one of the labels after the read began, so the value may predate it
+            if since is not None and any(
+                    self._label_generations.get(label, self._forgotten_generation) > since for label in labels
+            ):
+                self.stale_sets += 1
+                return
+
+            self._set(key, value)
+            self._labels_by_key[key] = labels
+            for label in labels:
+                self._keys_by_label.setdefault(label, set()).add(key)
+
+    def invalidate(self, *labels: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for label in labels:
+                self._label_generations[label] = self._generation
+                self._label_generations.move_to_end(label)
+                for key in self._keys_by_label.pop(label, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+            while len(self._label_generations) > self.max_entries:
+                _, self._forgotten_generation = self._label_generations.popitem(last=False)
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats["invalidations"] = self.invalidations
+        stats["stale_sets"] = self.stale_sets
+        return stats
+
+    def _remove(self, key: Hashable) -> None:
+        super()._remove(key)
+        for label in self._labels_by_key.pop(key, set()):
+            keys = self._keys_by_label.get(label)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_label[label]
+
+
+class FragmentCache(ResponseCache):
+    # Encoded JSON of single posts keyed by (schema, id, updated_at, embedded tags), so list responses only re-encode
+    # changed posts. A tag rename does not touch the post rows, and the label invalidation only reaches this process,
+    # so the embedded tag fields are part of the key. Writes in this process still invalidate by label as well, which
+    # drops the replaced fragments at once instead of leaving them to the size budget.
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        super().__init__(max_entries, ttl_seconds)
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+
+    def render_post(self, response_model: Any, post: Any, since: Optional[int] = None) -> bytes:
+        # since is this cache's generation(), taken before the post was read
+        tags = tuple((tag.id, tag.title, tag.slug) for tag in post.tags or ())
+        key = (response_model, post.id, post.updated_at, tags)
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = render_json(response_model, post)
+            self.set(
+                key, fragment, depends_on=[post_label(post.id), *[tag_label(tag.id) for tag in post.tags or ()]],
+                since=since
+            )
+        return fragment
+
+    def render_posts(self, response_model: Any, posts: Iterable[Any], since: Optional[int] = None) -> bytes:
+        return b"[" + b",".join(self.render_post(response_model, post, since) for post in posts) + b"]"
+
+    def set(self, key: Hashable, value: bytes, depends_on: Iterable[str] = (), since: Optional[int] = None) -> None:
+        if len(value) <= self.max_bytes:
+            super().set(key, value, depends_on, since)
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        stats["size_bytes"] = self.size_bytes
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+    def _set(self, key: Hashable, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        super()._set(key, value, ttl_seconds)
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        self.size_bytes -= len(self._entries[key][1])
+        super()._remove(key)
+
+
+def extend_json(document: bytes, **fields: bytes) -> bytes:
+    # Appends already encoded fields to an encoded JSON object, after its own fields as pydantic orders subclass fields
+    members = b",".join(json.dumps(name).encode("utf-8") + b":" + value for name, value in fields.items())
+    if document == b"{}":
+        return b"{" + members + b"}"
+    return document[:-1] + b"," + members + b"}"
+
+
+def render_json(response_model: Any, content: Any) -> bytes:
+    if FAST_JSON:
+        # Reads attributes straight off the rows, skipping validation; the output bytes are identical
+        encode = fast_json.encoder_for(response_model)
+        if encode is not None:
+            return fast_json.dumps(encode(content))
+
+    # Same validation and encoding FastAPI applies to a response_model, done once so the bytes can be cached
+    value = parse_obj_as(response_model, content)
+    return json.dumps(
+        jsonable_encoder(value),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,47 @@
+import gzip
+from typing import Dict, Optional
+
+import brotli
+
+from utils.env import GZIP_LEVEL, BROTLI_QUALITY
+
+# In order of preference when the client accepts several with the same quality
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    best_encoding, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best_encoding, best_quality = encoding, quality
+
+    return best_encoding
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return content_type is not None and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
@@ -0,0 +1,69 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable
+
+from fastapi import Request, Response, status
+
+from services.compression import negotiate_encoding, compress
+from utils.env import COMPRESSION_MIN_SIZE
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    # Compressed variants of body by content coding, dropped together with the entry when a write invalidates it
+    compressed: Dict[str, bytes] = field(default_factory=dict)
+
+
+def make_etag(cache_key: str, version: Iterable[Any]) -> str:
+    # The version is a cheap aggregate (row counts and max updated_at) of every row the response is built from.
+    # It is read from the database alone, so every worker, and every restart, computes the same ETag for the same rows.
+    digest = hashlib.sha1(repr((cache_key, tuple(version))).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    # Only If-None-Match is honoured. Every response aggregates several rows, and removing one of them
+    # (a deleted or unpublished post, a deleted tag) moves no timestamp, so If-Modified-Since could answer 304 wrongly.
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or _weak(etag) in [_weak(tag) for tag in candidates]
+
+
+def validator_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag))
+
+
+def conditional_response(request: Request, cached: CachedResponse) -> Response:
+    if is_not_modified(request, cached.etag):
+        return not_modified_response(cached.etag)
+
+    headers = validator_headers(cached.etag)
+    headers["Vary"] = "Accept-Encoding"
+    body = cached.body
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None and len(body) >= COMPRESSION_MIN_SIZE:
+        body = _precompressed(cached, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _precompressed(cached: CachedResponse, encoding: str) -> bytes:
+    # Kept on the entry, so they go together with it when a write invalidates it or it expires
+    body = cached.compressed.get(encoding)
+    if body is None:
+        body = cached.compressed[encoding] = compress(cached.body, encoding)
+    return body
+
+
+def _weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
@@ -0,0 +1,63 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin
+
+import orjson
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+Encoder = Callable[[Any], Any]
+
+
+def dumps(value: Any) -> bytes:
+    # orjson writes UUIDs and datetimes exactly as pydantic's json encoders do (str() and isoformat())
+    return orjson.dumps(value)
+
+
+@lru_cache(maxsize=None)
+def encoder_for(response_model: Any) -> Optional[Encoder]:
+    # Returns None when the model shape is not supported, so the caller falls back to pydantic
+    if get_origin(response_model) in (list, List):
+        item_encoder = encoder_for(get_args(response_model)[0])
+        if item_encoder is None:
+            return None
+        return lambda items: [item_encoder(item) for item in items]
+
+    if isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        return _compile(response_model)
+
+    return None
+
+
+def _compile(model) -> Optional[Encoder]:
+    # Fields are emitted in the model's declaration order, matching what pydantic's .dict() produces
+    fields: List[Tuple[str, Optional[Encoder]]] = []
+    for name, field in model.__fields__.items():
+        if field.alias != name:
+            return None
+
+        nested = field.type_ if isinstance(field.type_, type) and issubclass(field.type_, BaseModel) else None
+        if nested is None:
+            if field.shape != SHAPE_SINGLETON:
+                return None
+            fields.append((name, None))
+            continue
+
+        nested_encoder = _compile(nested)
+        if nested_encoder is None:
+            return None
+        if field.shape == SHAPE_LIST:
+            fields.append((name, lambda values, encode=nested_encoder: [encode(value) for value in values]))
+        elif field.shape == SHAPE_SINGLETON:
+            fields.append((name, nested_encoder))
+        else:
+            return None
+
+    def encode(obj: Any) -> Dict[str, Any]:
+        get = obj.get if isinstance(obj, dict) else obj.__getattribute__
+        data = {}
+        for name, field_encoder in fields:
+            value = get(name)
+            data[name] = field_encoder(value) if field_encoder is not None and value is not None else value
+        return data
+
+    return encode
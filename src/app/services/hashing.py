@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class HashingPool:
+
+    def __init__(self, max_workers: int, use_processes: bool = True):
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rebuilds = 0
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        # The executor's worker count is the concurrency limit, anything beyond it waits in the executor queue
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.in_flight += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue_depth())
+
+        started_at = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenExecutor:
+                # A worker died (e.g. killed for memory) and the pool now rejects every call, so replace it and retry
+                self._discard(executor)
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_ms += elapsed_ms
+                self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "executor": "process" if self.use_processes else "thread",
+                "max_workers": self.max_workers,
+                "in_flight": self.in_flight,
+                "queue_depth": self._queue_depth(),
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "average_ms": round(self.total_ms / self.completed, 3) if self.completed else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "rebuilds": self.rebuilds,
+            }
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app never forks or spawns threads
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    # crypt() holds the GIL, so only separate processes keep hashing off the event loop.
+                    # Spawned workers start a fresh interpreter and import only utils.passwords to run the calls.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password-hashing"
+                    )
+            return self._executor
+
+    def _discard(self, executor: Executor) -> None:
+        with self._lock:
+            # Concurrent calls may all see the same broken pool; only the first one replaces it
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.rebuilds += 1
+        executor.shutdown(wait=False)
+
+    def _queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
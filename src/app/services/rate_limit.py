@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from fastapi import Request
+
+from exceptions import TooManyRequestsError
+from utils.env import TRUSTED_PROXY_HEADER
+
+
+class TokenBucketLimiter:
+
+    def __init__(self, capacity: int, refill_per_second: float, max_keys: int):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        # key -> (tokens left, time of last update); least recently seen keys are dropped first
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.denied = 0
+        self.evictions = 0
+
+    def acquire(self, key: Hashable) -> float:
+        # Returns 0 when a token was taken, otherwise the seconds until the next token is available
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+                self.allowed += 1
+            else:
+                retry_after = (1 - tokens) / self.refill_per_second
+                self.denied += 1
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+
+            return retry_after
+
+
+def client_ip(request: Request) -> str:
+    # Behind a reverse proxy request.client is the proxy itself, so every client would share one bucket.
+    # The proxy appends the address it saw as the last entry; entries before it come from the client and can be forged.
+    if TRUSTED_PROXY_HEADER:
+        forwarded = request.headers.get(TRUSTED_PROXY_HEADER, "").split(",")[-1].strip()
+        if forwarded:
+            return forwarded
+
+    return request.client.host if request.client else "unknown"
+
+
+async def _account_from_body(request: Request, account_field: str) -> Optional[str]:
+    # Starlette caches the parsed body on the request, so the route reads it again for free
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            body = await request.json()
+        else:
+            body = await request.form()
+    except Exception:
+        return None
+
+    value = body.get(account_field) if hasattr(body, "get") else None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+def rate_limit(
+        ip_limiter: TokenBucketLimiter,
+        account_limiter: Optional[TokenBucketLimiter] = None,
+        account_field: Optional[str] = None
+) -> Callable:
+
+    async def check_rate_limit(request: Request) -> None:
+        retry_after = ip_limiter.acquire(client_ip(request))
+
+        if not retry_after and account_limiter is not None and account_field:
+            account = await _account_from_body(request, account_field)
+            if account:
+                retry_after = account_limiter.acquire(account)
+
+        if retry_after:
+            raise TooManyRequestsError(retry_after=retry_after)
+
+    return check_rate_limit
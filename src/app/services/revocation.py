@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import AsyncSessionLocal
+from models import RevokedToken
+from utils.logger import setup_logger
+
+logger = setup_logger(modname=__name__)
+
+# Rows are re-read a little before the last seen created_at, so late commits are not missed
+SYNC_OVERLAP = timedelta(minutes=1)
+
+
+def _to_epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationStore:
+
+    def __init__(self):
+        # jti -> exp (epoch seconds); probed on every authenticated request without touching the DB
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires_at
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            self._expires_at[jti] = expires_at
+
+    async def sync(self, db: AsyncSession) -> None:
+        now = datetime.utcnow()
+        statement = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at)\
+            .where(RevokedToken.expires_at > now)
+        if self._watermark is not None:
+            statement = statement.where(RevokedToken.created_at >= self._watermark - SYNC_OVERLAP)
+        rows = (await db.execute(statement)).all()
+
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await db.commit()
+
+        now_epoch = time.time()
+        with self._lock:
+            for jti, expires_at, _ in rows:
+                self._expires_at[jti] = _to_epoch(expires_at)
+            # Expired tokens are rejected by their exp claim, so their entries are no longer needed
+            self._expires_at = {
+                jti: expires_at for jti, expires_at in self._expires_at.items() if expires_at > now_epoch
+            }
+            if rows:
+                self._watermark = max(created_at for _, _, created_at in rows)
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.sync(db)
+            except Exception:
+                logger.exception("Failed to sync revoked tokens")
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run(interval_seconds))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,67 @@
+import time
+from typing import List, Optional
+
+import pytest
+from starlette.requests import Request
+
+from cruds import public_read_crud
+from database import AsyncSessionLocal
+from schemas import post_schema
+from services.cache import render_json
+from services.compression import compress
+from services.conditional import CachedResponse, conditional_response
+from ..conftest import run
+
+pytestmark = pytest.mark.benchmark
+
+POSTS = 200
+REQUESTS = 200
+
+
+def render_public_posts() -> bytes:
+    async def read():
+        async with AsyncSessionLocal() as db:
+            return await public_read_crud.get_public_posts(db)
+
+    return render_json(List[post_schema.PostSummary], run(read()))
+
+
+def make_request(accept_encoding: Optional[str]) -> Request:
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "headers": headers})
+
+
+def cpu_per_request(step) -> float:
+    started = time.process_time()
+    for _ in range(REQUESTS):
+        step()
+    return (time.process_time() - started) / REQUESTS
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_compression_shrinks_the_body_and_is_paid_once_per_entry(make_posts, report, encoding):
+    make_posts(POSTS)
+    body = render_public_posts()
+    request = make_request(encoding)
+
+    compressed = compress(body, encoding)
+    encode_seconds = cpu_per_request(lambda: compress(body, encoding))
+    # Every request compressing again, as a plain compression middleware would
+    uncached_seconds = cpu_per_request(
+        lambda: conditional_response(request, CachedResponse(body=body, etag='W/"etag"'))
+    )
+    cached = CachedResponse(body=body, etag='W/"etag"')
+    conditional_response(request, cached)
+    cached_seconds = cpu_per_request(lambda: conditional_response(request, cached))
+    identity_seconds = cpu_per_request(lambda: conditional_response(make_request(None), cached))
+
+    report(
+        f"compression: /posts/public with {POSTS} posts, {len(body)} bytes identity, "
+        f"{len(compressed)} bytes {encoding} ({len(compressed) / len(body):.0%}); "
+        f"encode {encode_seconds * 1e6:.0f} us CPU; "
+        f"per response {uncached_seconds * 1e6:.0f} us compressing each time, "
+        f"{cached_seconds * 1e6:.0f} us precompressed, {identity_seconds * 1e6:.0f} us identity"
+    )
+    assert conditional_response(request, cached).body == compressed
+    assert len(compressed) < len(body)
+    assert cached_seconds < uncached_seconds
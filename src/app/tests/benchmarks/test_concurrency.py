@@ -0,0 +1,66 @@
+import asyncio
+import sqlite3
+import time
+from typing import Tuple
+
+import pytest
+from sqlalchemy import text
+
+from cruds import post_crud
+from database import AsyncSessionLocal, engine
+from ..conftest import run
+
+pytestmark = pytest.mark.benchmark
+
+# A recursive count that keeps SQLite busy for a few hundred milliseconds
+SLOW_QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 2000000) SELECT count(*) FROM n"
+
+
+async def async_slow_query() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(text(SLOW_QUERY))
+
+
+async def blocking_slow_query() -> None:
+    # What a synchronous Session did inside an async route: the query runs on the event loop thread
+    connection = sqlite3.connect(engine.url.database)
+    try:
+        connection.execute(SLOW_QUERY).fetchall()
+    finally:
+        connection.close()
+
+
+async def fast_reads_during(slow_query) -> Tuple[int, float]:
+    done = asyncio.Event()
+    completed = 0
+
+    async def fast_reads():
+        nonlocal completed
+        async with AsyncSessionLocal() as db:
+            while not done.is_set():
+                await post_crud.get_public_posts_version(db)
+                if not done.is_set():
+                    completed += 1
+
+    async def slow():
+        await slow_query()
+        done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(slow(), fast_reads())
+    return completed, time.perf_counter() - started
+
+
+def test_fast_requests_keep_flowing_during_a_slow_query(make_posts, report):
+    make_posts(20)
+
+    blocking_count, blocking_seconds = run(fast_reads_during(blocking_slow_query))
+    async_count, async_seconds = run(fast_reads_during(async_slow_query))
+
+    report(
+        f"concurrency: reads completed while a slow query ran: "
+        f"sync session {blocking_count} in {blocking_seconds * 1000:.0f} ms, "
+        f"async session {async_count} in {async_seconds * 1000:.0f} ms ({async_count / async_seconds:.0f}/s)"
+    )
+    assert blocking_count == 0
+    assert async_count > 0
@@ -0,0 +1,47 @@
+import time
+from typing import List, Tuple
+
+import pytest
+
+from cruds import public_read_crud
+from database import AsyncSessionLocal
+from schemas import post_schema
+from services import cache
+from ..conftest import run
+
+pytestmark = pytest.mark.benchmark
+
+POSTS = 200
+RENDERS = 50
+
+
+def read_public_posts():
+    async def read():
+        async with AsyncSessionLocal() as db:
+            return await public_read_crud.get_public_posts(db)
+
+    return run(read())
+
+
+def renders_per_second(monkeypatch, fast_json: bool, posts) -> Tuple[float, bytes]:
+    monkeypatch.setattr(cache, "FAST_JSON", fast_json)
+    body = cache.render_json(List[post_schema.PostSummary], posts)
+    started = time.perf_counter()
+    for _ in range(RENDERS):
+        cache.render_json(List[post_schema.PostSummary], posts)
+    return RENDERS / (time.perf_counter() - started), body
+
+
+def test_fast_json_renders_the_same_bytes_faster(make_posts, report, monkeypatch):
+    make_posts(POSTS)
+    posts = read_public_posts()
+
+    pydantic_rate, pydantic_body = renders_per_second(monkeypatch, False, posts)
+    fast_rate, fast_body = renders_per_second(monkeypatch, True, posts)
+
+    report(
+        f"json: /posts/public with {POSTS} posts ({len(fast_body)} bytes): pydantic + jsonable_encoder "
+        f"{pydantic_rate:.0f} renders/s, fast path {fast_rate:.0f} renders/s"
+    )
+    assert fast_body == pydantic_body
+    assert fast_rate > pydantic_rate
@@ -0,0 +1,76 @@
+import os
+import queue
+import time
+from logging import FileHandler, Filter, Formatter, Logger, LogRecord, StreamHandler, getLogger, DEBUG
+from logging.handlers import QueueListener, TimedRotatingFileHandler
+
+import pytest
+
+from utils.logger import DeferredQueueHandler, JsonFormatter, RedactFieldsFilter, SamplingFilter
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 5000
+
+
+class FormattingPasswordFilter(Filter):
+    # The filter the CRUD loggers used before: it formats every record to search the text
+
+    def filter(self, record: LogRecord) -> bool:
+        return "password" not in record.getMessage()
+
+
+def fresh_logger(name: str) -> Logger:
+    logger = getLogger(name)
+    logger.setLevel(DEBUG)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    return logger
+
+
+def log_requests(logger: Logger) -> float:
+    # Each CRUD call logs a "run" and a "success" record
+    started = time.perf_counter()
+    for index in range(REQUESTS):
+        logger.info({"action": "Get post by id", "post_id": index, "status": "Run"})
+        logger.info({"action": "Get post by id", "status": "Success"})
+    return (time.perf_counter() - started) / REQUESTS
+
+
+def test_request_threads_only_enqueue_log_records(tmp_path, report):
+    with open(os.devnull, "w") as devnull:
+        before = fresh_logger("benchmarks.logging.before")
+        stream = StreamHandler(devnull)
+        stream.setFormatter(Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        file = FileHandler(tmp_path / "before.log")
+        file.setFormatter(Formatter('%(asctime)s - %(filename)s - %(name)s - %(lineno)d - %(levelname)s - %(message)s'))
+        before.addHandler(stream)
+        before.addHandler(file)
+        before.addFilter(FormattingPasswordFilter())
+        before_seconds = log_requests(before)
+        file.close()
+
+        log_queue = queue.SimpleQueue()
+        stream = StreamHandler(devnull)
+        stream.setFormatter(Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        rotating = TimedRotatingFileHandler(tmp_path / "after.log", when="midnight", encoding="utf-8")
+        rotating.setFormatter(JsonFormatter())
+        for handler in (stream, rotating):
+            handler.addFilter(RedactFieldsFilter())
+        listener = QueueListener(log_queue, stream, rotating, respect_handler_level=True)
+        listener.start()
+        after = fresh_logger("benchmarks.logging.after")
+        after.addHandler(DeferredQueueHandler(log_queue))
+        after.addFilter(SamplingFilter(1.0))
+        after_seconds = log_requests(after)
+        drain_started = time.perf_counter()
+        listener.stop()
+        drain_seconds = time.perf_counter() - drain_started
+        rotating.close()
+
+    report(
+        f"logging: per request (2 records) on the request thread: synchronous handlers {before_seconds * 1e6:.1f} us, "
+        f"queue {after_seconds * 1e6:.1f} us; listener drained the rest in {drain_seconds * 1000:.0f} ms"
+    )
+    assert after_seconds < before_seconds
@@ -0,0 +1,65 @@
+import time
+from typing import List
+
+import pytest
+from sqlalchemy import event
+
+from database import engine
+from utils.env import API_PREFIX
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 100
+
+
+def p99(latencies: List[float]) -> float:
+    return sorted(latencies)[int(len(latencies) * 0.99) - 1]
+
+
+def test_post_create_and_update_commit_once(client, auth_headers, tags, report):
+    commits = []
+
+    def record(conn):
+        commits.append(conn)
+
+    event.listen(engine.sync_engine, "commit", record)
+    try:
+        created, create_latencies, create_commits = [], [], 0
+        for index in range(REQUESTS):
+            commits.clear()
+            started = time.perf_counter()
+            response = client.post(
+                f"{API_PREFIX}/posts/create",
+                json={
+                    "post_data": {"title": f"Post {index}", "content": "content", "is_public": True},
+                    "tag_ids": [str(tag.id) for tag in tags]
+                },
+                headers=auth_headers
+            )
+            create_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 201
+            created.append(response.json()["id"])
+            create_commits += len(commits)
+
+        update_latencies, update_commits = [], 0
+        for post_id in created:
+            commits.clear()
+            started = time.perf_counter()
+            response = client.put(
+                f"{API_PREFIX}/posts/{post_id}",
+                json={"post_data": {"title": f"Updated {post_id}"}, "tag_ids": [str(tags[0].id)]},
+                headers=auth_headers
+            )
+            update_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+            update_commits += len(commits)
+    finally:
+        event.remove(engine.sync_engine, "commit", record)
+
+    report(
+        f"post writes: create with 2 tags {create_commits / REQUESTS:.2f} commits/request, "
+        f"p99 {p99(create_latencies) * 1000:.1f} ms; update dropping a tag {update_commits / REQUESTS:.2f} "
+        f"commits/request, p99 {p99(update_latencies) * 1000:.1f} ms"
+    )
+    assert create_commits == REQUESTS
+    assert update_commits == REQUESTS
@@ -0,0 +1,95 @@
+import tracemalloc
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import desc, select
+from sqlalchemy.orm import selectinload
+
+from cruds import public_read_crud
+from database import AsyncSessionLocal
+from models import Post, Tag
+from schemas import post_schema, tag_schema
+from services.cache import extend_json, render_json
+from ..conftest import run
+
+pytestmark = pytest.mark.benchmark
+
+POSTS = 200
+
+
+async def orm_public_posts(db):
+    # The ORM read the public list used before the row layer
+    result = await db.execute(
+        select(Post).options(selectinload(Post.tags))
+        .where(Post.is_public.is_(True))
+        .order_by(desc(Post.updated_at), desc(Post.id))
+    )
+    return result.scalars().all()
+
+
+async def row_public_posts(db):
+    return await public_read_crud.get_public_posts(db)
+
+
+def render_posts(posts) -> bytes:
+    return render_json(List[post_schema.PostSummary], posts)
+
+
+async def orm_tag_with_posts(db):
+    result = await db.execute(
+        select(Tag)
+        .options(selectinload(Tag.posts.and_(Post.is_public.is_(True))).selectinload(Post.tags))
+        .where(Tag.slug == "python")
+    )
+    return result.scalars().first()
+
+
+async def row_tag_with_posts(db):
+    return await public_read_crud.get_tag_with_posts("python", db)
+
+
+def render_tag(tag) -> bytes:
+    posts = sorted(tag.posts, key=lambda post: (post.updated_at, post.id), reverse=True)
+    return extend_json(render_json(tag_schema.Tag, tag), posts=render_json(List[post_schema.PostSummary], posts))
+
+
+def measure(read, render) -> Tuple[int, int, int]:
+    # Bytes and blocks held by what the read materialized, and the peak traced bytes of reading and rendering
+    async def traced():
+        async with AsyncSessionLocal() as db:
+            render(await read(db))
+        # A fresh session, so the ORM read cannot reuse instances from the warm-up's identity map
+        async with AsyncSessionLocal() as db:
+            tracemalloc.start()
+            try:
+                before = tracemalloc.take_snapshot()
+                content = await read(db)
+                after = tracemalloc.take_snapshot()
+                render(content)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        stats = after.compare_to(before, "filename")
+        return sum(stat.size_diff for stat in stats), sum(stat.count_diff for stat in stats), peak
+
+    return run(traced())
+
+
+@pytest.mark.parametrize("name, orm_read, row_read, render", [
+    ("/posts/public", orm_public_posts, row_public_posts, render_posts),
+    ("/tags/{tag_slug}", orm_tag_with_posts, row_tag_with_posts, render_tag),
+])
+def test_row_reads_use_less_memory_than_orm_reads(make_posts, report, name, orm_read, row_read, render):
+    make_posts(POSTS)
+
+    orm_bytes, orm_blocks, orm_peak = measure(orm_read, render)
+    row_bytes, row_blocks, row_peak = measure(row_read, render)
+
+    report(
+        f"read memory: {name} with {POSTS} posts: ORM holds {orm_bytes / 1024:.0f} KiB in {orm_blocks} blocks, "
+        f"peak {orm_peak / 1024:.0f} KiB; rows hold {row_bytes / 1024:.0f} KiB in {row_blocks} blocks, "
+        f"peak {row_peak / 1024:.0f} KiB"
+    )
+    assert row_bytes < orm_bytes
+    assert row_blocks < orm_blocks
+    assert row_peak < orm_peak
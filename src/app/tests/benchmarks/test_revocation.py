@@ -0,0 +1,55 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import RevokedToken
+from services import auth_service
+from services.cache import TtlLruCache
+from services.revocation import RevocationStore
+from ..conftest import run
+
+pytestmark = pytest.mark.benchmark
+
+REVOKED = 100_000
+REQUESTS = 5000
+
+
+def per_request(step, requests: int = REQUESTS) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        step()
+    return (time.perf_counter() - started) / requests
+
+
+def test_revocation_check_stays_flat_at_100k_entries(client, report, monkeypatch):
+    monkeypatch.setattr(auth_service, "claims_cache", TtlLruCache(max_entries=16, ttl_seconds=60))
+    monkeypatch.setattr(auth_service, "revocation_store", RevocationStore())
+    token = auth_service.create_access_token({"sub": uuid.uuid4().hex})
+    expires_at = time.time() + 3600
+
+    empty_seconds = per_request(lambda: auth_service.decode_jwt(token))
+    for _ in range(REVOKED):
+        auth_service.revocation_store.add(str(uuid.uuid4()), expires_at)
+    full_seconds = per_request(lambda: auth_service.decode_jwt(token))
+
+    async def database_probe():
+        # The alternative the in-memory store avoids: one indexed lookup per authenticated request
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            for _ in range(REQUESTS // 10):
+                await db.execute(select(RevokedToken.jti).where(RevokedToken.jti == "not-revoked"))
+            return (time.perf_counter() - started) / (REQUESTS // 10)
+
+    database_seconds = run(database_probe())
+
+    report(
+        f"revocation: decode_jwt with cached claims {empty_seconds * 1e6:.2f} us with no revoked tokens, "
+        f"{full_seconds * 1e6:.2f} us with {len(auth_service.revocation_store)}; "
+        f"a database probe instead costs {database_seconds * 1e6:.0f} us"
+    )
+    assert len(auth_service.revocation_store) == REVOKED
+    assert full_seconds < empty_seconds * 3
+    assert full_seconds < database_seconds
@@ -0,0 +1,157 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+# utils.env reads the environment when the app is first imported, so the test settings go in before any app import
+_tmp_dir = tempfile.mkdtemp(prefix="api-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["LOG_FILE"] = os.path.join(_tmp_dir, "api.log")
+os.environ["HASH_USE_PROCESSES"] = "False"
+for name, value in {
+    "MARIADB_USER": "test",
+    "MARIADB_PASSWORD": "test",
+    "MARIADB_DATABASE": "test",
+    "MARIADB_HOST": "localhost",
+    "CSRF_SECRET_KEY": "test-csrf-secret",
+    "JWT_SECRET_KEY": "test-jwt-secret",
+    "ALGORITHM": "HS256",
+    "JWT_EXPIRE_MINUTES": "30",
+    "JWT_NOT_BEFORE_SECONDS": "0",
+    "CORS_ORIGIN_WHITELIST": "http://localhost",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from database import AsyncSessionLocal, Base, engine  # noqa: E402
+from main import app  # noqa: E402
+from models import Admin, Post, Tag  # noqa: E402
+from services import auth_service, response_cache, fragment_cache, principal_cache  # noqa: E402
+from utils.env import API_PREFIX  # noqa: E402
+from utils.passwords import hash_password  # noqa: E402
+
+
+_benchmark_lines: List[str] = []
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmarks", action="store_true", default=False, help="run the tests marked benchmark")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: slow measurement, skipped unless --run-benchmarks is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _benchmark_lines:
+        terminalreporter.section("benchmarks")
+        for line in _benchmark_lines:
+            terminalreporter.write_line(line)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _reset_schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture
+def client() -> TestClient:
+    run(_reset_schema())
+    for cache in (response_cache, fragment_cache, principal_cache):
+        cache.clear()
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin(client) -> Admin:
+    async def create():
+        async with AsyncSessionLocal() as db:
+            db_admin = Admin(
+                email="admin@example.com", hashed_password=hash_password("password"), is_active=True,
+                email_verified=True
+            )
+            db.add(db_admin)
+            await db.commit()
+            return db_admin
+
+    return run(create())
+
+
+@pytest.fixture
+def auth_headers(client, admin) -> dict:
+    token = auth_service.create_access_token({"sub": admin.id.hex})
+    csrf_token = client.get(f"{API_PREFIX}/admin/csrftoken").json()["csrf_token"]
+    return {"Authorization": f"Bearer {token}", "X-CSRF-Token": csrf_token}
+
+
+@pytest.fixture
+def tags(client) -> List[Tag]:
+    async def create():
+        async with AsyncSessionLocal() as db:
+            db_tags = [Tag(title="Python", slug="python"), Tag(title="JavaScript", slug="javascript")]
+            db.add_all(db_tags)
+            await db.commit()
+            return db_tags
+
+    return run(create())
+
+
+@pytest.fixture
+def make_posts(admin, tags):
+    # Creates public posts directly, with distinct updated_at values unless one is given
+    def make(count: int, updated_at: datetime = None, is_public: bool = True) -> List[Post]:
+        async def create():
+            async with AsyncSessionLocal() as db:
+                db_tags = [await db.get(Tag, tag.id) for tag in tags]
+                posts = [
+                    Post(
+                        title=f"Post {index}", url_slug=f"post-{index}-{os.urandom(4).hex()}", content="content",
+                        description="description", is_public=is_public, author_id=admin.id,
+                        updated_at=updated_at or datetime(2022, 1, 1) + timedelta(minutes=index), tags=db_tags
+                    )
+                    for index in range(count)
+                ]
+                db.add_all(posts)
+                await db.commit()
+                return posts
+
+        return run(create())
+
+    return make
+
+
+@pytest.fixture
+def report():
+    # Benchmark numbers, printed in the summary at the end of the run
+    return _benchmark_lines.append
+
+
+@pytest.fixture
+def queries() -> List[str]:
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
@@ -0,0 +1,136 @@
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import update
+
+from database import AsyncSessionLocal
+from models import Tag
+from schemas import post_schema
+from services import response_cache
+from services.cache import FragmentCache, ResponseCache, POST_LIST, TAG_LIST, post_label
+from utils.env import API_PREFIX
+from .conftest import run
+
+
+def test_set_is_skipped_when_a_label_was_invalidated_during_the_read():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+
+    generation = cache.generation()
+    # A write commits and invalidates while the response is still being built
+    cache.invalidate(POST_LIST)
+    cache.set("stale", b"old body", depends_on=[POST_LIST], since=generation)
+    cache.set("unrelated", b"tags", depends_on=[TAG_LIST], since=generation)
+
+    assert cache.get("stale") is None
+    assert cache.get("unrelated") == b"tags"
+    assert cache.stats()["stale_sets"] == 1
+
+
+def test_set_after_the_invalidation_is_kept():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+
+    cache.invalidate(POST_LIST)
+    generation = cache.generation()
+    cache.set("fresh", b"new body", depends_on=[POST_LIST], since=generation)
+
+    assert cache.get("fresh") == b"new body"
+
+
+def test_fragment_is_not_kept_when_its_post_was_invalidated_during_the_read():
+    post = SimpleNamespace(
+        id=uuid4(), title="Post", url_slug="post", thumbnail=None, is_public=True, created_at=datetime(2022, 1, 1),
+        updated_at=datetime(2022, 1, 1), tags=[]
+    )
+    cache = FragmentCache(max_entries=10, max_bytes=100_000, ttl_seconds=60)
+
+    generation = cache.generation()
+    cache.invalidate(post_label(post.id))
+    cache.render_post(post_schema.PostSummary, post, since=generation)
+
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["stale_sets"] == 1
+
+
+def test_label_generations_are_bounded_and_forgotten_labels_skip_older_sets():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+
+    generation = cache.generation()
+    for post_id in ("deleted-1", "deleted-2", "deleted-3"):
+        cache.invalidate(post_label(post_id))
+    assert len(cache._label_generations) == 2
+
+    cache.set("stale", b"old body", depends_on=[post_label("deleted-1")], since=generation)
+    cache.set("fresh", b"new body", depends_on=[post_label("deleted-1")], since=cache.generation())
+
+    assert cache.get("stale") is None
+    assert cache.get("fresh") == b"new body"
+
+
+def create_post(client, auth_headers, title: str, tag_ids=()) -> dict:
+    response = client.post(
+        f"{API_PREFIX}/posts/create",
+        json={"post_data": {"title": title, "content": "content", "is_public": True}, "tag_ids": list(tag_ids)},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def public_titles(client) -> list:
+    return [post["title"] for post in client.get(f"{API_PREFIX}/posts/public").json()]
+
+
+def test_post_writes_invalidate_cached_lists_and_details(client, auth_headers):
+    post = create_post(client, auth_headers, "First")
+    assert public_titles(client) == ["First"]
+    assert client.get(f"{API_PREFIX}/posts/{post['url_slug']}").json()["title"] == "First"
+
+    update = client.put(
+        f"{API_PREFIX}/posts/{post['id']}",
+        json={"post_data": {"title": "Renamed"}, "tag_ids": []},
+        headers=auth_headers
+    )
+    assert update.status_code == 200
+    assert public_titles(client) == ["Renamed"]
+    assert client.get(f"{API_PREFIX}/posts/{post['url_slug']}").json()["title"] == "Renamed"
+
+    assert client.delete(f"{API_PREFIX}/posts/{post['id']}", headers=auth_headers).status_code == 200
+    assert public_titles(client) == []
+    assert client.get(f"{API_PREFIX}/posts/{post['url_slug']}").status_code == 404
+
+
+def test_tag_writes_invalidate_cached_tag_pages(client, auth_headers, tags):
+    python = tags[0]
+    create_post(client, auth_headers, "Tagged", tag_ids=[str(python.id)])
+    assert [post["title"] for post in client.get(f"{API_PREFIX}/tags/python").json()["posts"]] == ["Tagged"]
+
+    create_post(client, auth_headers, "Second", tag_ids=[str(python.id)])
+    assert len(client.get(f"{API_PREFIX}/tags/python").json()["posts"]) == 2
+
+
+def test_tag_rename_reaches_cached_post_fragments(client, auth_headers, tags):
+    post = create_post(client, auth_headers, "Tagged", tag_ids=[str(tags[0].id)])
+    assert client.get(f"{API_PREFIX}/posts/{post['url_slug']}").json()["tags"][0]["title"] == "Python"
+
+    response = client.put(f"{API_PREFIX}/tags/{tags[0].id}", json={"title": "Python 3"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    assert client.get(f"{API_PREFIX}/posts/{post['url_slug']}").json()["tags"][0]["title"] == "Python 3"
+    assert client.get(f"{API_PREFIX}/posts/public").json()[0]["tags"][0]["title"] == "Python 3"
+
+
+def test_tag_renamed_by_another_process_is_not_served_from_fragments(client, auth_headers, tags):
+    create_post(client, auth_headers, "Tagged", tag_ids=[str(tags[0].id)])
+    assert client.get(f"{API_PREFIX}/posts/public").json()[0]["tags"][0]["title"] == "Python"
+
+    async def rename():
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Tag).where(Tag.id == tags[0].id).values(title="Python 3"))
+            await db.commit()
+
+    # Another worker renamed the tag: nothing was invalidated here, and the response entry then expires
+    run(rename())
+    response_cache.clear()
+
+    assert client.get(f"{API_PREFIX}/posts/public").json()[0]["tags"][0]["title"] == "Python 3"
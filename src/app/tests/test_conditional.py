@@ -0,0 +1,68 @@
+from services import response_cache
+from services.cache import POST_LIST
+from utils.env import API_PREFIX
+
+PUBLIC_POSTS = f"{API_PREFIX}/posts/public"
+
+
+def test_matching_etag_returns_304(client, make_posts):
+    make_posts(2)
+    etag = client.get(PUBLIC_POSTS).headers["ETag"]
+
+    # Once from the cached response, once rebuilt from the version query
+    assert client.get(PUBLIC_POSTS, headers={"If-None-Match": etag}).status_code == 304
+    client.get(f"{API_PREFIX}/tags")
+    assert client.get(PUBLIC_POSTS, headers={"If-None-Match": f"W/\"other\", {etag}"}).status_code == 304
+
+
+def test_writes_in_the_same_second_change_the_etag(client, auth_headers):
+    created = client.post(
+        f"{API_PREFIX}/posts/create",
+        json={"post_data": {"title": "First", "content": "content", "is_public": True}, "tag_ids": []},
+        headers=auth_headers
+    ).json()
+    list_etag = client.get(PUBLIC_POSTS).headers["ETag"]
+    detail_etag = client.get(f"{API_PREFIX}/posts/{created['url_slug']}").headers["ETag"]
+
+    # Two edits well within one second of each other still move updated_at, and so the version
+    for title in ("Second", "Third"):
+        client.put(
+            f"{API_PREFIX}/posts/{created['id']}",
+            json={"post_data": {"title": title}, "tag_ids": []},
+            headers=auth_headers
+        )
+        response = client.get(PUBLIC_POSTS, headers={"If-None-Match": list_etag})
+        assert response.status_code == 200
+        assert response.json()[0]["title"] == title
+        list_etag = response.headers["ETag"]
+
+        response = client.get(f"{API_PREFIX}/posts/{created['url_slug']}", headers={"If-None-Match": detail_etag})
+        assert response.status_code == 200
+        detail_etag = response.headers["ETag"]
+
+
+def test_list_ignores_if_modified_since(client, make_posts, auth_headers):
+    posts = make_posts(2)
+    response = client.get(PUBLIC_POSTS)
+    assert "Last-Modified" not in response.headers
+
+    # Deleting the older post leaves max(updated_at) where it was
+    client.delete(f"{API_PREFIX}/posts/{posts[0].id}", headers=auth_headers)
+    response = client.get(PUBLIC_POSTS, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+
+def test_etag_depends_only_on_the_rows(client, make_posts, auth_headers):
+    make_posts(2)
+    etag = client.get(PUBLIC_POSTS).headers["ETag"]
+
+    # Another worker, or a restart, rebuilds the same ETag from the same rows, whatever this cache went through
+    response_cache.invalidate(POST_LIST)
+    assert client.get(PUBLIC_POSTS, headers={"If-None-Match": etag}).status_code == 304
+
+    # A tag no public post carries is not part of the list
+    response = client.post(f"{API_PREFIX}/tags/create", json={"title": "Unused"}, headers=auth_headers)
+    assert response.status_code == 201
+    assert client.get(PUBLIC_POSTS, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,42 @@
+import asyncio
+import os
+from concurrent.futures import BrokenExecutor
+
+import pytest
+
+from services.hashing import HashingPool
+from utils.passwords import hash_password, verify_password
+
+
+@pytest.fixture
+def process_pool():
+    pool = HashingPool(max_workers=1, use_processes=True)
+    yield pool
+    pool.shutdown()
+
+
+def test_workers_import_only_the_password_module(process_pool):
+    async def worker_modules():
+        hashed = await process_pool.run(hash_password, "password")
+        assert verify_password("password", hashed)
+        # eval is a builtin, so it pickles by name and runs against the worker's own sys.modules
+        return await process_pool.run(eval, "sorted(__import__('sys').modules)")
+
+    modules = asyncio.run(worker_modules())
+
+    assert "utils.passwords" in modules
+    for module in ("services", "database", "models", "utils.logger"):
+        assert module not in modules
+
+
+def test_broken_pool_is_replaced(process_pool):
+    async def crash_then_hash():
+        # The worker exits mid-call: the retry on a fresh pool exits too, then the next call gets another pool
+        with pytest.raises(BrokenExecutor):
+            await process_pool.run(os._exit, 1)
+        return await process_pool.run(hash_password, "password")
+
+    hashed = asyncio.run(crash_then_hash())
+
+    assert verify_password("password", hashed)
+    assert process_pool.stats()["rebuilds"] == 2
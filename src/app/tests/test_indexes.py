@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from sqlalchemy import inspect, select
+
+from cruds.domain.pagination import keyset_statement
+from cruds.domain.rows import POST_SUMMARY_COLUMNS
+from database import engine
+from models import Post
+from .conftest import run
+
+MIGRATION = Path(__file__).resolve().parents[2] / "db" / "migrations" / "versions" / \
+    "b7e4c2d9f013_add_post_list_indexes.py"
+EXPECTED_INDEXES = {
+    "posts": {"ix_posts_is_public_updated_at_id", "ix_posts_author_id_updated_at_id"},
+    "tag_post_map": {"ix_tag_post_map_post_id_tag_id"},
+}
+
+
+def schema():
+    async def inspect_schema():
+        async with engine.connect() as conn:
+            return await conn.run_sync(lambda sync_conn: {
+                "indexes": {
+                    table: {index["name"] for index in inspect(sync_conn).get_indexes(table)}
+                    for table in EXPECTED_INDEXES
+                },
+                "tag_post_map_pk": inspect(sync_conn).get_pk_constraint("tag_post_map")["constrained_columns"],
+            })
+
+    return run(inspect_schema())
+
+
+def test_models_and_migration_declare_the_same_indexes(client):
+    created = schema()
+    migration = MIGRATION.read_text()
+
+    for table, names in EXPECTED_INDEXES.items():
+        assert names <= created["indexes"][table]
+        for name in names:
+            assert f"'{name}'" in migration
+    assert created["tag_post_map_pk"] == ["tag_id", "post_id"]
+
+
+def test_public_post_page_reads_the_keyset_index(client):
+    statement = keyset_statement(select(*POST_SUMMARY_COLUMNS).where(Post.is_public.is_(True)), 20, None)
+    sql = str(statement.compile(engine.sync_engine, compile_kwargs={"literal_binds": True}))
+
+    async def query_plan():
+        async with engine.connect() as conn:
+            return [row[-1] for row in await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+    plan = " ".join(run(query_plan()))
+
+    assert "ix_posts_is_public_updated_at_id" in plan
+    assert "TEMP B-TREE" not in plan
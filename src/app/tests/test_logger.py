@@ -0,0 +1,28 @@
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import TimedRotatingFileHandler
+
+from utils import logger
+
+
+def file_handler_count() -> int:
+    logger.setup_logger("tests.logger")
+    return sum(isinstance(handler, TimedRotatingFileHandler) for handler in logger._listener.handlers)
+
+
+def test_a_spawned_serving_process_writes_the_log_file():
+    # uvicorn --reload and --workers serve the app from a spawned child
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        child_count = executor.submit(file_handler_count).result()
+
+    assert child_count == 1
+
+
+def test_log_to_file_setting_disables_the_file_handler(monkeypatch):
+    monkeypatch.setattr(logger, "LOG_TO_FILE", False)
+    # A queue of its own keeps this listener, stopped at exit, apart from the shared one
+    monkeypatch.setattr(logger, "_log_queue", queue.SimpleQueue())
+    listener = logger._start_listener()
+
+    assert not any(isinstance(handler, TimedRotatingFileHandler) for handler in listener.handlers)
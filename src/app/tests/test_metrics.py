@@ -0,0 +1,24 @@
+from services import auth_service, response_cache
+from services.cache import POST_LIST
+from utils.env import API_PREFIX
+
+
+def test_cache_metrics_report_stale_sets(client, auth_headers):
+    before = client.get(f"{API_PREFIX}/metrics/cache", headers=auth_headers).json()["stale_sets"]
+    generation = response_cache.generation()
+    response_cache.invalidate(POST_LIST)
+    response_cache.set("stale", b"old body", depends_on=[POST_LIST], since=generation)
+
+    response = client.get(f"{API_PREFIX}/metrics/cache", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["stale_sets"] == before + 1
+
+
+def test_hashing_metrics_report_rebuilds(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(auth_service.hashing_pool, "rebuilds", 2)
+
+    response = client.get(f"{API_PREFIX}/metrics/hashing", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["rebuilds"] == 2
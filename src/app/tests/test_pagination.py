@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import datetime
+
+from utils.env import API_PREFIX
+
+
+def create_posts(client, auth_headers, count: int) -> set:
+    # Posts created through the API take updated_at from the database clock, with its fraction of a second
+    ids = set()
+    for index in range(count):
+        response = client.post(
+            f"{API_PREFIX}/posts/create",
+            json={"post_data": {"title": f"Created {index}", "content": "content", "is_public": True}, "tag_ids": []},
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+        ids.add(response.json()["id"])
+    return ids
+
+
+def walk_pages(client, url: str, limit: int, max_pages: int, **kwargs) -> list:
+    ids, cursor = [], None
+    for _ in range(max_pages):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params, **kwargs)
+        assert response.status_code == 200
+        page = response.json()
+        ids.extend(post["id"] for post in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+    raise AssertionError(f"no last page after {max_pages} pages")
+
+
+def test_public_posts_walk_every_page_once(client, auth_headers, make_posts):
+    tied = make_posts(3, updated_at=datetime(2022, 1, 1, 12, 0, 0, 500000))
+    expected = {str(post.id) for post in tied + make_posts(5)} | create_posts(client, auth_headers, 6)
+
+    ids = walk_pages(client, f"{API_PREFIX}/posts/public", limit=2, max_pages=10)
+
+    assert len(ids) == len(set(ids))
+    assert set(ids) == expected
+
+
+def test_my_posts_walk_every_page_once(client, auth_headers, make_posts):
+    expected = {str(post.id) for post in make_posts(3)} | create_posts(client, auth_headers, 4)
+
+    ids = walk_pages(client, f"{API_PREFIX}/posts", limit=3, max_pages=10, headers=auth_headers)
+
+    assert len(ids) == len(set(ids))
+    assert set(ids) == expected
+
+
+def test_malformed_cursors_are_rejected(client, make_posts):
+    make_posts(1)
+    crafted = [
+        "not base64 at all",
+        base64.urlsafe_b64encode(b"{}").decode(),
+        base64.urlsafe_b64encode(json.dumps(["2022-01-01T00:00:00", 5]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps([None, None]).encode()).decode(),
+    ]
+
+    for cursor in crafted:
+        response = client.get(f"{API_PREFIX}/posts/public", params={"limit": 1, "cursor": cursor})
+        assert response.status_code == 400, cursor
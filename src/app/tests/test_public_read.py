@@ -0,0 +1,9 @@
+from utils.env import API_PREFIX
+
+
+def test_tag_posts_are_newest_first(client, make_posts):
+    posts = make_posts(4)
+
+    ids = [post["id"] for post in client.get(f"{API_PREFIX}/tags/python").json()["posts"]]
+
+    assert ids == [str(post.id) for post in reversed(posts)]
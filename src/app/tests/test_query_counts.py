@@ -0,0 +1,64 @@
+from services import response_cache, fragment_cache, principal_cache
+from utils.env import API_PREFIX
+
+
+def count_queries(client, queries, url, **kwargs) -> int:
+    # Caches are cleared so every request reaches the database
+    for cache in (response_cache, fragment_cache, principal_cache):
+        cache.clear()
+    queries.clear()
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200
+    return len(queries)
+
+
+def test_public_post_list_query_count_does_not_grow_with_posts(client, make_posts, queries):
+    make_posts(2)
+    few = count_queries(client, queries, f"{API_PREFIX}/posts/public")
+
+    make_posts(10)
+    many = count_queries(client, queries, f"{API_PREFIX}/posts/public")
+
+    assert len(client.get(f"{API_PREFIX}/posts/public").json()) == 12
+    assert few == many
+
+
+def test_public_post_page_query_count_does_not_grow_with_posts(client, make_posts, queries):
+    make_posts(2)
+    few = count_queries(client, queries, f"{API_PREFIX}/posts/public", params={"limit": 20})
+
+    make_posts(10)
+    many = count_queries(client, queries, f"{API_PREFIX}/posts/public", params={"limit": 20})
+
+    assert few == many
+
+
+def test_my_post_list_query_count_does_not_grow_with_posts(client, make_posts, auth_headers, queries):
+    make_posts(2)
+    few = count_queries(client, queries, f"{API_PREFIX}/posts", headers=auth_headers)
+
+    make_posts(10)
+    many = count_queries(client, queries, f"{API_PREFIX}/posts", headers=auth_headers)
+
+    assert few == many
+
+
+def test_tag_with_posts_query_count_does_not_grow_with_posts(client, make_posts, queries):
+    make_posts(2)
+    few = count_queries(client, queries, f"{API_PREFIX}/tags/python")
+
+    make_posts(10)
+    many = count_queries(client, queries, f"{API_PREFIX}/tags/python")
+
+    assert len(client.get(f"{API_PREFIX}/tags/python").json()["posts"]) == 12
+    assert few == many
+
+
+def test_post_detail_loads_tags_without_a_query_per_tag(client, make_posts, queries):
+    post = make_posts(1)[0]
+
+    count = count_queries(client, queries, f"{API_PREFIX}/posts/{post.url_slug}")
+
+    assert len(client.get(f"{API_PREFIX}/posts/{post.url_slug}").json()["tags"]) == 2
+    # Version check, the post, and its tags in one batch
+    assert count <= 3
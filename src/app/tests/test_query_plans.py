@@ -0,0 +1,103 @@
+import re
+from typing import List, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from cruds import admin_crud, post_crud, tag_crud, public_read_crud, search_crud
+from database import AsyncSessionLocal, engine
+from models import Post
+from .conftest import run
+
+# SQLite counterpart of src/db/explain_queries.py: the same reads, checked with EXPLAIN QUERY PLAN on every test run.
+# Reads that cover a whole table by design and may scan or sort it
+ALLOWED_SCANS = {
+    "TagCrud.get_tags": "lists every tag",
+    "TagCrud.get_tags_version": "aggregates every tag",
+    "TagCrud.get_public_post_tags_version": "aggregates the tags of every public post",
+    "SearchCrud.search_public_posts": "sorts the FTS5 matches by relevance",
+    "PublicReadCrud.get_tag_with_posts": "sorts the posts of one tag, found through the tag_post_map primary key",
+}
+FULL_SCAN = re.compile(r"\bSCAN (posts|tags|tag_post_map)\b")
+
+
+def workload(admin, post, tag) -> dict:
+    return {
+        "PostCrud.get_my_posts": lambda db: post_crud.get_my_posts(admin.id, db),
+        "PostCrud.get_my_posts_page": lambda db: post_crud.get_my_posts_page(admin.id, 20, None, db),
+        "PostCrud.get_public_posts_version": lambda db: post_crud.get_public_posts_version(db),
+        "PostCrud.get_public_post_version": lambda db: post_crud.get_public_post_version(post.url_slug, db),
+        "PostCrud.get_post": lambda db: post_crud.get_post(post.id, db),
+        "PostCrud.get_owned_post": lambda db: post_crud.get_owned_post(post.id, admin.id, db),
+        "PostCrud.get_public_post_by_slug": lambda db: post_crud.get_public_post_by_slug(post.url_slug, db),
+        "PublicReadCrud.get_public_posts": lambda db: public_read_crud.get_public_posts(db),
+        "PublicReadCrud.get_public_posts_page": lambda db: public_read_crud.get_public_posts_page(20, None, db),
+        "PublicReadCrud.get_tag_with_posts": lambda db: public_read_crud.get_tag_with_posts(tag.slug, db),
+        "SearchCrud.search_public_posts": lambda db: search_crud.search_public_posts("content", 20, 0, db),
+        "SlugService.slug_exists": lambda db: post_crud.slug_service.slug_exists(Post.url_slug, post.url_slug, db),
+        "SlugService.unique_slug": lambda db: post_crud.slug_service.unique_slug(Post.url_slug, post.title, db),
+        "TagCrud.get_tags": lambda db: tag_crud.get_tags(db),
+        "TagCrud.get_tag": lambda db: tag_crud.get_tag(tag.id, db),
+        "TagCrud.get_tag_by_title": lambda db: tag_crud.get_tag_by_title(tag.title, db),
+        "TagCrud.get_tags_version": lambda db: tag_crud.get_tags_version(db),
+        "TagCrud.get_public_post_tags_version": lambda db: tag_crud.get_public_post_tags_version(db),
+        "TagCrud.get_tag_version": lambda db: tag_crud.get_tag_version(tag.slug, db),
+        "AdminCrud.get_admin_by_id": lambda db: admin_crud.get_admin_by_id(admin.id, db),
+        "AdminCrud.get_principal": lambda db: admin_crud.get_principal(admin.id, db),
+        "AdminCrud.get_admin_by_email": lambda db: admin_crud.get_admin_by_email(admin.email, db),
+    }
+
+
+def capture_reads(admin, post, tag) -> List[Tuple[str, str, tuple]]:
+    captured, current = [], {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((current["label"], statement, parameters))
+
+    async def read_all():
+        async with AsyncSessionLocal() as db:
+            for label, call in workload(admin, post, tag).items():
+                current["label"] = label
+                await call(db)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        run(read_all())
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    return captured
+
+
+def query_plans(captured: List[Tuple[str, str, tuple]]) -> List[Tuple[str, str, str]]:
+    async def explain_all():
+        plans = []
+        async with engine.connect() as conn:
+            for label, statement, parameters in captured:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append((label, statement, " | ".join(row[-1] for row in result)))
+        return plans
+
+    return run(explain_all())
+
+
+@pytest.fixture
+def plans(admin, tags, make_posts) -> List[Tuple[str, str, str]]:
+    posts = make_posts(3) + make_posts(2, is_public=False)
+    return query_plans(capture_reads(admin, posts[0], tags[0]))
+
+
+def test_every_crud_read_is_explained(plans):
+    labels = {label for label, _, _ in plans}
+
+    assert labels == set(workload(None, None, None))
+
+
+def test_crud_reads_use_indexes(plans):
+    failures = [
+        f"{label}: {plan}\n    {' '.join(statement.split())}"
+        for label, statement, plan in plans
+        if label not in ALLOWED_SCANS and (FULL_SCAN.search(plan) or "USE TEMP B-TREE" in plan)
+    ]
+
+    assert not failures, "\n".join(failures)
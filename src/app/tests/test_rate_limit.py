@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+from starlette.requests import Request
+
+from services import login_ip_limiter, rate_limit
+from utils.env import API_PREFIX, LOGIN_RATE_LIMIT_IP_BURST
+
+
+def make_request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("10.0.0.1", 50000),
+    })
+
+
+def test_peer_address_is_used_without_a_trusted_header(monkeypatch):
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_HEADER", "")
+
+    assert rate_limit.client_ip(make_request({"X-Forwarded-For": "203.0.113.7"})) == "10.0.0.1"
+
+
+def test_trusted_header_uses_the_address_the_proxy_appended(monkeypatch):
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_HEADER", "X-Forwarded-For")
+
+    assert rate_limit.client_ip(make_request({"X-Forwarded-For": "198.51.100.1, 203.0.113.7"})) == "203.0.113.7"
+    assert rate_limit.client_ip(make_request({})) == "10.0.0.1"
+
+
+def test_admin_creation_shares_the_login_ip_limit(client, monkeypatch):
+    monkeypatch.setattr(login_ip_limiter, "_buckets", OrderedDict())
+
+    url = f"{API_PREFIX}/admin/create"
+    statuses = [client.post(url, json={}).status_code for _ in range(LOGIN_RATE_LIMIT_IP_BURST + 1)]
+
+    assert 429 not in statuses[:-1]
+    assert statuses[-1] == 429
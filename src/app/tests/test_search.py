@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from cruds.search import SearchCrud
+from services import response_cache
+from utils.env import API_PREFIX
+
+SEARCH = f"{API_PREFIX}/posts/search"
+
+
+def create_post(client, auth_headers, title: str, content: str) -> dict:
+    response = client.post(
+        f"{API_PREFIX}/posts/create",
+        json={"post_data": {"title": title, "content": content, "is_public": True}, "tag_ids": []},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def search_titles(client, query: str) -> list:
+    response = client.get(SEARCH, params={"q": query})
+    assert response.status_code == 200
+    return [hit["title"] for hit in response.json()["items"]]
+
+
+def test_search_follows_writes(client, auth_headers):
+    post = create_post(client, auth_headers, "Alpha", "about asyncio")
+    assert search_titles(client, "asyncio") == ["Alpha"]
+
+    client.put(
+        f"{API_PREFIX}/posts/{post['id']}",
+        json={"post_data": {"content": "about generators"}, "tag_ids": []},
+        headers=auth_headers
+    )
+    assert search_titles(client, "asyncio") == []
+    assert search_titles(client, "generators") == ["Alpha"]
+
+    client.delete(f"{API_PREFIX}/posts/{post['id']}", headers=auth_headers)
+    assert search_titles(client, "generators") == []
+
+
+def test_search_responses_are_not_cached_but_revalidate(client, auth_headers):
+    create_post(client, auth_headers, "Alpha", "about asyncio")
+    response = client.get(SEARCH, params={"q": "asyncio"})
+
+    assert response_cache.stats()["entries"] == 0
+    revalidated = client.get(SEARCH, params={"q": "asyncio"}, headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_marker_characters_in_content_do_not_unbalance_the_snippet(client, auth_headers):
+    create_post(client, auth_headers, "Alpha", "about \x03asyncio\x02 and \x02more")
+
+    snippet = client.get(SEARCH, params={"q": "asyncio"}).json()["items"][0]["snippet"]
+
+    assert snippet.count("<mark>") == snippet.count("</mark>") == 1
+    assert "<mark>asyncio</mark>" in snippet
+
+
+def test_window_snippet_strips_marker_characters():
+    row = SimpleNamespace(snippet="about \x03asyncio\x02 and \x02more", snippet_start=1)
+
+    snippet = SearchCrud()._window_snippet(row, ["asyncio"])
+
+    assert snippet == "about <mark>asyncio</mark> and more"
@@ -0,0 +1,24 @@
+from utils.env import API_PREFIX
+
+
+def create_posts(client, auth_headers, title: str, count: int) -> list:
+    slugs = []
+    for _ in range(count):
+        response = client.post(
+            f"{API_PREFIX}/posts/create",
+            json={"post_data": {"title": title, "content": "content", "is_public": True}, "tag_ids": []},
+            headers=auth_headers
+        )
+        assert response.status_code == 201
+        slugs.append(response.json()["url_slug"])
+    return slugs
+
+
+def test_generated_slugs_get_a_collision_suffix(client, auth_headers):
+    assert create_posts(client, auth_headers, "Hello World", 3) == ["hello-world", "hello-world-2", "hello-world-3"]
+
+
+def test_empty_titles_get_a_fallback_slug(client, auth_headers):
+    create_posts(client, auth_headers, "Hello World", 1)
+
+    assert create_posts(client, auth_headers, "", 2) == ["post", "post-2"]
@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database import engine
+from .conftest import run
+
+
+def test_failed_statements_do_not_leave_a_start_time_behind(client):
+    async def fail_then_succeed():
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.exec_driver_sql("SELECT * FROM no_such_table")
+            await conn.exec_driver_sql("SELECT 1")
+            return list(conn.sync_connection.info["query_started_at"])
+
+    assert run(fail_then_succeed()) == []
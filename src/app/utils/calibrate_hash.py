@@ -0,0 +1,84 @@
+import argparse
+import math
+import time
+from typing import List, Optional
+
+from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from utils.passwords import build_context
+from utils.env import HASH_SCHEMES, HASH_ROUNDS, HASH_MEMORY_COST
+
+SAMPLE_PASSWORD = "calibration-password"
+
+
+def measure(context: CryptContext, samples: int) -> List[float]:
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        context.hash(SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return sorted(timings)
+
+
+def percentile(sorted_timings: List[float], fraction: float) -> float:
+    index = min(len(sorted_timings) - 1, max(0, math.ceil(fraction * len(sorted_timings)) - 1))
+    return sorted_timings[index]
+
+
+def scale_rounds(scheme: str, rounds: int, measured_ms: float, target_ms: float) -> int:
+    handler = get_crypt_handler(scheme)
+    if scheme == "bcrypt":
+        # bcrypt rounds are a log2 cost, every step doubles the time
+        rounds = rounds + round(math.log2(target_ms / measured_ms))
+    else:
+        rounds = round(rounds * target_ms / measured_ms)
+    return max(handler.min_rounds, min(handler.max_rounds, rounds))
+
+
+def calibrate(scheme: str, target_ms: float, memory_cost: Optional[int]) -> int:
+    rounds = get_crypt_handler(scheme).default_rounds
+    # Cost is close to linear in rounds, so a few corrections settle on the target
+    for _ in range(4):
+        measured_ms = percentile(measure(build_context([scheme], rounds, memory_cost), samples=3), 0.5)
+        candidate = scale_rounds(scheme, rounds, measured_ms, target_ms)
+        if candidate == rounds:
+            break
+        rounds = candidate
+    return rounds
+
+
+def report(label: str, timings: List[float]) -> None:
+    print(f"{label}: p50={percentile(timings, 0.5):.1f}ms p99={percentile(timings, 0.99):.1f}ms (n={len(timings)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick password hash parameters for a target time on this host")
+    parser.add_argument("--scheme", default=HASH_SCHEMES[0], help="sha256_crypt, sha512_crypt, bcrypt or argon2")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target time for one hash")
+    parser.add_argument("--samples", type=int, default=20, help="hashes timed for the p50/p99 report")
+    parser.add_argument("--memory-cost", type=int, default=HASH_MEMORY_COST, help="argon2 memory in KiB")
+    args = parser.parse_args()
+
+    report(
+        f"current {HASH_SCHEMES[0]} rounds={HASH_ROUNDS or 'default'}",
+        measure(build_context(HASH_SCHEMES, HASH_ROUNDS, HASH_MEMORY_COST), args.samples)
+    )
+
+    rounds = calibrate(args.scheme, args.target_ms, args.memory_cost)
+    report(
+        f"calibrated {args.scheme} rounds={rounds}",
+        measure(build_context([args.scheme], rounds, args.memory_cost), args.samples)
+    )
+
+    # Keep the old schemes listed so existing hashes still verify and get rehashed at the next login
+    schemes = [args.scheme] + [scheme for scheme in HASH_SCHEMES if scheme != args.scheme]
+    print()
+    print(f"HASH_SCHEMES={','.join(schemes)}")
+    print(f"HASH_ROUNDS={rounds}")
+    if args.scheme == "argon2" and args.memory_cost:
+        print(f"HASH_MEMORY_COST={args.memory_cost}")
+
+
+if __name__ == "__main__":
+    main()
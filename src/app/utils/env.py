@@ -1,5 +1,10 @@
 from decouple import config, Csv
 
+
+def _optional_int(value):
+    return int(value) if value else None
+
+
 API_TITLE = "Portfolio site"
 API_VERSION = "1.0.0"
 API_PREFIX = f"/api/v{API_VERSION}"
@@ -8,11 +13,69 @@ DB_USER = config("MARIADB_USER", cast=str)
 DB_PASSWORD = config("MARIADB_PASSWORD")
 DB_DATABASE = config("MARIADB_DATABASE", cast=str)
 DB_HOST = config("MARIADB_HOST", cast=str)
+# e.g. "sqlite+aiosqlite:///./local.db" for local runs without MariaDB
+DATABASE_URL = config(
+    "DATABASE_URL", default=f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_DATABASE}?charset=utf8"
+)
+DB_ECHO = config("DB_ECHO", default=False, cast=bool)
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+# Recycle before MariaDB's wait_timeout closes idle connections
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=3600, cast=int)
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30, cast=int)
+
+# One process per file: with uvicorn --workers, turn this off or give each worker its own LOG_FILE
+LOG_TO_FILE = config("LOG_TO_FILE", default=True, cast=bool)
+LOG_FILE = config("LOG_FILE", default="log/api.log")
+LOG_BACKUP_DAYS = config("LOG_BACKUP_DAYS", default=30, cast=int)
+# Fraction of the "run"/"success" progress records that are kept
+LOG_SAMPLE_RATE = config("LOG_SAMPLE_RATE", default=1.0, cast=float)
+
+SLOW_QUERY_MS = config("SLOW_QUERY_MS", default=200, cast=float)
+# Development aid: warn when one request repeats the same statement more than the threshold
+SQL_N_PLUS_ONE_DETECTION = config("SQL_N_PLUS_ONE_DETECTION", default=False, cast=bool)
+SQL_N_PLUS_ONE_THRESHOLD = config("SQL_N_PLUS_ONE_THRESHOLD", default=5, cast=int)
 
 CSRF_SECRET_KEY = config("CSRF_SECRET_KEY")
 JWT_SECRET_KEY = config('JWT_SECRET_KEY')
 ALGORITHM = config('ALGORITHM', cast=str)
 JWT_EXPIRE_MINUTES = config('JWT_EXPIRE_MINUTES', cast=int)
 JWT_NOT_BEFORE_SECONDS = config('JWT_NOT_BEFORE_SECONDS', cast=int)
+JWT_REFRESH_WINDOW_MINUTES = config('JWT_REFRESH_WINDOW_MINUTES', default=5, cast=int)
+JWT_CLAIMS_CACHE_MAX_ENTRIES = config('JWT_CLAIMS_CACHE_MAX_ENTRIES', default=1024, cast=int)
+JWT_REVOCATION_SYNC_SECONDS = config('JWT_REVOCATION_SYNC_SECONDS', default=30, cast=int)
+
+HASH_WORKERS = config("HASH_WORKERS", default=2, cast=int)
+HASH_USE_PROCESSES = config("HASH_USE_PROCESSES", default=True, cast=bool)
+HASH_SCHEMES = config("HASH_SCHEMES", default="sha256_crypt", cast=Csv())
+HASH_ROUNDS = config("HASH_ROUNDS", default=None, cast=_optional_int)
+HASH_MEMORY_COST = config("HASH_MEMORY_COST", default=None, cast=_optional_int)
+
+LOGIN_RATE_LIMIT_IP_BURST = config("LOGIN_RATE_LIMIT_IP_BURST", default=10, cast=int)
+LOGIN_RATE_LIMIT_IP_PER_MINUTE = config("LOGIN_RATE_LIMIT_IP_PER_MINUTE", default=10, cast=float)
+LOGIN_RATE_LIMIT_ACCOUNT_BURST = config("LOGIN_RATE_LIMIT_ACCOUNT_BURST", default=5, cast=int)
+LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE = config("LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE", default=5, cast=float)
+RATE_LIMIT_MAX_KEYS = config("RATE_LIMIT_MAX_KEYS", default=10000, cast=int)
+# e.g. "X-Forwarded-For" when every request arrives through a reverse proxy that sets it; empty uses the peer address
+TRUSTED_PROXY_HEADER = config("TRUSTED_PROXY_HEADER", default="")
+
+POST_PAGE_SIZE = config("POST_PAGE_SIZE", default=20, cast=int)
+POST_PAGE_SIZE_MAX = config("POST_PAGE_SIZE_MAX", default=100, cast=int)
+SEARCH_QUERY_MAX_LENGTH = config("SEARCH_QUERY_MAX_LENGTH", default=200, cast=int)
+
+RESPONSE_CACHE_MAX_ENTRIES = config("RESPONSE_CACHE_MAX_ENTRIES", default=512, cast=int)
+RESPONSE_CACHE_TTL_SECONDS = config("RESPONSE_CACHE_TTL_SECONDS", default=300, cast=int)
+FRAGMENT_CACHE_MAX_ENTRIES = config("FRAGMENT_CACHE_MAX_ENTRIES", default=10000, cast=int)
+FRAGMENT_CACHE_MAX_BYTES = config("FRAGMENT_CACHE_MAX_BYTES", default=16 * 1024 * 1024, cast=int)
+FRAGMENT_CACHE_TTL_SECONDS = config("FRAGMENT_CACHE_TTL_SECONDS", default=3600, cast=int)
+FAST_JSON = config("FAST_JSON", default=False, cast=bool)
+
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=500, cast=int)
+GZIP_LEVEL = config("GZIP_LEVEL", default=6, cast=int)
+BROTLI_QUALITY = config("BROTLI_QUALITY", default=5, cast=int)
+
+PRINCIPAL_CACHE_MAX_ENTRIES = config("PRINCIPAL_CACHE_MAX_ENTRIES", default=1024, cast=int)
+PRINCIPAL_CACHE_TTL_SECONDS = config("PRINCIPAL_CACHE_TTL_SECONDS", default=30, cast=int)
 
 CORS_ORIGIN_WHITELIST = config("CORS_ORIGIN_WHITELIST", cast=Csv())
@@ -1,24 +1,115 @@
-from logging import getLogger, StreamHandler, Formatter, FileHandler, DEBUG
+import atexit
+import json
+import os
+import queue
+import random
+from logging import getLogger, StreamHandler, Formatter, Filter, LogRecord, Logger, DEBUG
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Optional
 
+from utils.env import LOG_TO_FILE, LOG_FILE, LOG_BACKUP_DAYS, LOG_SAMPLE_RATE
 
-def setup_logger(log_folder, log_filter=None, modname=__name__):
-    logger = getLogger(modname)
-    logger.setLevel(DEBUG)
+REDACTED_FIELDS = {"password", "password_confirm", "current_password", "hashed_password", "access_token", "token"}
+SAMPLED_STATUSES = {"run", "success"}
+
+_log_queue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(Formatter):
+
+    def format(self, record: LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+        }
+        if isinstance(record.msg, dict):
+            entry.update(record.msg)
+        else:
+            entry["message"] = record.getMessage()
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RedactFieldsFilter(Filter):
+
+    def filter(self, record: LogRecord) -> bool:
+        if isinstance(record.msg, dict) and not REDACTED_FIELDS.isdisjoint(record.msg):
+            record.msg = {
+                key: "***" if key in REDACTED_FIELDS else value for key, value in record.msg.items()
+            }
+        return True
+
+
+class SamplingFilter(Filter):
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: LogRecord) -> bool:
+        if self.sample_rate >= 1 or not isinstance(record.msg, dict):
+            return True
+        if str(record.msg.get("status", "")).lower() not in SAMPLED_STATUSES:
+            return True
+        return random.random() < self.sample_rate
 
-    if not logger.hasHandlers():
 
-        sh = StreamHandler()
-        sh.setLevel(DEBUG)
-        formatter = Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        sh.setFormatter(formatter)
-        logger.addHandler(sh)
+class DeferredQueueHandler(QueueHandler):
 
-        fh = FileHandler(log_folder)
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # The queue never leaves the process, so formatting is left to the listener thread
+        return record
+
+
+def _start_listener() -> QueueListener:
+    sh = StreamHandler()
+    sh.setLevel(DEBUG)
+    sh.setFormatter(Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    handlers = [sh]
+
+    # TimedRotatingFileHandler is not safe across processes: two of them writing and rotating one file lose records.
+    # LOG_TO_FILE picks the process that owns the file, so it is an explicit setting rather than a guess from here.
+    if LOG_TO_FILE:
+        log_folder = os.path.dirname(LOG_FILE)
+        if log_folder:
+            os.makedirs(log_folder, exist_ok=True)
+
+        fh = TimedRotatingFileHandler(LOG_FILE, when="midnight", backupCount=LOG_BACKUP_DAYS, encoding="utf-8")
         fh.setLevel(DEBUG)
-        fh_formatter = Formatter('%(asctime)s - %(filename)s - %(name)s - %(lineno)d - %(levelname)s - %(message)s')
-        fh.setFormatter(fh_formatter)
-        logger.addHandler(fh)
+        fh.setFormatter(JsonFormatter())
+        handlers.append(fh)
+
+    redact_filter = RedactFieldsFilter()
+    for handler in handlers:
+        handler.addFilter(redact_filter)
+
+    listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def setup_logger(modname=__name__, log_filter=None, sample_rate: Optional[float] = None) -> Logger:
+    global _listener
+
+    logger = getLogger(modname)
+    logger.setLevel(DEBUG)
+
+    if not logger.handlers:
+        if _listener is None:
+            _listener = _start_listener()
+
+        # Request code only enqueues records; the listener thread formats and writes them
+        logger.addHandler(DeferredQueueHandler(_log_queue))
+        logger.propagate = False
 
+        logger.addFilter(SamplingFilter(LOG_SAMPLE_RATE if sample_rate is None else sample_rate))
         if log_filter:
             logger.addFilter(log_filter)
 
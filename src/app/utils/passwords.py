@@ -0,0 +1,42 @@
+from typing import Optional, Sequence, Tuple
+
+from passlib.context import CryptContext
+
+from utils.env import HASH_SCHEMES, HASH_ROUNDS, HASH_MEMORY_COST
+
+# Hashing worker processes unpickle these functions by importing this module, so it must stay free of the services,
+# database and logging imports: only passlib and the settings.
+
+
+def build_context(
+        schemes: Sequence[str], rounds: Optional[int] = None, memory_cost: Optional[int] = None
+) -> CryptContext:
+    # The first scheme hashes new passwords, the rest are only accepted for verification
+    preferred = schemes[0]
+    settings = {}
+    if rounds is not None:
+        # rounds is time_cost for argon2 and the log2 cost for bcrypt.
+        # Pinning min/max makes needs_update flag hashes made with any other cost.
+        settings[f"{preferred}__default_rounds"] = rounds
+        settings[f"{preferred}__min_rounds"] = rounds
+        settings[f"{preferred}__max_rounds"] = rounds
+    if memory_cost is not None and preferred == "argon2":
+        settings["argon2__memory_cost"] = memory_cost
+
+    return CryptContext(schemes=list(schemes), deprecated="auto", **settings)
+
+
+# Module level so worker processes build the same context on import
+pwd_context = build_context(HASH_SCHEMES, HASH_ROUNDS, HASH_MEMORY_COST)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
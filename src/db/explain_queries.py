@@ -0,0 +1,114 @@
+import asyncio
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+
+from database import AsyncSessionLocal, engine
+from cruds import admin_crud, post_crud, tag_crud, public_read_crud, search_crud
+from models import Admin, Post, Tag
+
+# Reads that cover a whole table by design and may scan it
+ALLOWED_SCANS = {
+    "TagCrud.get_tags": "lists every tag",
+    "TagCrud.get_tags_version": "aggregates every tag",
+    "TagCrud.get_public_post_tags_version": "aggregates the tags of every public post",
+    "SearchCrud.search_public_posts": "sorts the FULLTEXT matches by relevance",
+    "PublicReadCrud.get_tag_with_posts": "sorts the posts of one tag, found through the tag_post_map primary key",
+}
+
+captured: List[Tuple[str, str, tuple]] = []
+current_label: Optional[str] = None
+
+
+def capture(conn, cursor, statement, parameters, context, executemany):
+    if current_label and not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+        captured.append((current_label, statement, parameters))
+
+
+async def run_workload() -> bool:
+    global current_label
+
+    async with AsyncSessionLocal() as db:
+        admin = (await db.execute(select(Admin).limit(1))).scalars().first()
+        post = (await db.execute(select(Post).where(Post.is_public.is_(True)).limit(1))).scalars().first()
+        tag = (await db.execute(select(Tag).limit(1))).scalars().first()
+        if not admin or not post or not tag:
+            print("Seed an admin, a public post and a tag first (see seed.py)")
+            return False
+
+        workload = {
+            "PostCrud.get_my_posts": lambda: post_crud.get_my_posts(admin.id, db),
+            "PostCrud.get_my_posts_page": lambda: post_crud.get_my_posts_page(admin.id, 20, None, db),
+            "PostCrud.get_public_posts_version": lambda: post_crud.get_public_posts_version(db),
+            "PostCrud.get_public_post_version": lambda: post_crud.get_public_post_version(post.url_slug, db),
+            "PostCrud.get_post": lambda: post_crud.get_post(post.id, db),
+            "PostCrud.get_owned_post": lambda: post_crud.get_owned_post(post.id, admin.id, db),
+            "PostCrud.get_public_post_by_slug": lambda: post_crud.get_public_post_by_slug(post.url_slug, db),
+            "PublicReadCrud.get_public_posts": lambda: public_read_crud.get_public_posts(db),
+            "PublicReadCrud.get_public_posts_page": lambda: public_read_crud.get_public_posts_page(20, None, db),
+            "PublicReadCrud.get_tag_with_posts": lambda: public_read_crud.get_tag_with_posts(tag.slug, db),
+            "SearchCrud.search_public_posts": lambda: search_crud.search_public_posts(post.title, 20, 0, db),
+            "SlugService.slug_exists": lambda: post_crud.slug_service.slug_exists(Post.url_slug, post.url_slug, db),
+            "SlugService.unique_slug": lambda: post_crud.slug_service.unique_slug(Post.url_slug, post.title, db),
+            "TagCrud.get_tags": lambda: tag_crud.get_tags(db),
+            "TagCrud.get_tag": lambda: tag_crud.get_tag(tag.id, db),
+            "TagCrud.get_tag_by_title": lambda: tag_crud.get_tag_by_title(tag.title, db),
+            "TagCrud.get_tags_version": lambda: tag_crud.get_tags_version(db),
+            "TagCrud.get_public_post_tags_version": lambda: tag_crud.get_public_post_tags_version(db),
+            "TagCrud.get_tag_version": lambda: tag_crud.get_tag_version(tag.slug, db),
+            "AdminCrud.get_admin_by_id": lambda: admin_crud.get_admin_by_id(admin.id, db),
+            "AdminCrud.get_principal": lambda: admin_crud.get_principal(admin.id, db),
+            "AdminCrud.get_admin_by_email": lambda: admin_crud.get_admin_by_email(admin.email, db),
+        }
+        for label, call in workload.items():
+            current_label = label
+            await call()
+        current_label = None
+
+    return True
+
+
+def problems(plan: List[Dict]) -> List[str]:
+    found = []
+    for row in plan:
+        extra = row.get("Extra") or ""
+        if row.get("type") == "ALL":
+            found.append(f"full scan of {row.get('table')}")
+        if "filesort" in extra:
+            found.append(f"filesort on {row.get('table')}")
+    return found
+
+
+async def explain_all() -> int:
+    failures = 0
+    async with engine.connect() as conn:
+        # Makes the optimizer prefer any usable index, so tiny dev tables still show what a large one would do
+        await conn.exec_driver_sql("SET SESSION max_seeks_for_key = 1")
+        for label, statement, parameters in captured:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            found = problems([dict(row) for row in result.mappings()])
+            if found and label not in ALLOWED_SCANS:
+                failures += 1
+                print(f"FAIL {label}: {', '.join(found)}\n    {' '.join(statement.split())}")
+            else:
+                print(f"ok   {label}" + (f" ({ALLOWED_SCANS[label]})" if found else ""))
+
+    return failures
+
+
+async def main() -> int:
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        if not await run_workload():
+            return 2
+        failures = await explain_all()
+    finally:
+        await engine.dispose()
+
+    print(f"\n{len(captured)} statements explained, {failures} regressed to a full scan or filesort")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,27 @@
+"""add posts fulltext index for search
+
+Revision ID: e3a91f6c2d58
+Revises: b7e4c2d9f013
+Create Date: 2026-10-18 16:41:09.318472
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a91f6c2d58'
+down_revision = 'b7e4c2d9f013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MATCH (title, description, content) in SearchCrud must name exactly these columns to use the index
+    op.create_index(
+        'ft_posts_title_description_content', 'posts', ['title', 'description', 'content'],
+        unique=False, mysql_prefix='FULLTEXT'
+    )
+
+
+def downgrade():
+    op.drop_index('ft_posts_title_description_content', table_name='posts')
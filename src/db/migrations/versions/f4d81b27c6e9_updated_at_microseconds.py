@@ -0,0 +1,37 @@
+"""keep microseconds in updated_at
+
+Revision ID: f4d81b27c6e9
+Revises: e3a91f6c2d58
+Create Date: 2026-10-18 21:12:44.902317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'f4d81b27c6e9'
+down_revision = 'e3a91f6c2d58'
+branch_labels = None
+depends_on = None
+
+TABLES = ('admins', 'posts', 'tags', 'revoked_tokens')
+
+
+def upgrade():
+    # updated_at versions rows for ETags and keyset cursors, so two writes within one second must differ
+    for table in TABLES:
+        op.alter_column(table, 'updated_at',
+                   existing_type=mysql.TIMESTAMP(),
+                   type_=mysql.TIMESTAMP(fsp=6),
+                   server_default=sa.text('current_timestamp(6) on update current_timestamp(6)'),
+                   existing_nullable=False)
+
+
+def downgrade():
+    for table in TABLES:
+        op.alter_column(table, 'updated_at',
+                   existing_type=mysql.TIMESTAMP(fsp=6),
+                   type_=mysql.TIMESTAMP(),
+                   server_default=sa.text('current_timestamp on update current_timestamp'),
+                   existing_nullable=False)
@@ -1,36 +1,44 @@
-from database import SessionLocal
-from models import Admin, Post, Tag
-
-db = SessionLocal()
+import asyncio
 
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
-def seed():
-    new_admin = Admin(email="guest@gmail.com", hashed_password="secrethashedpassword")
-    db.add(new_admin)
-    db.commit()
-
-    new_tag = Tag(title="Python", slug="python")
-    db.add(new_tag)
-    new_tag = Tag(title="React.js", slug="reactjs")
-    db.add(new_tag)
-    db.commit()
+from database import AsyncSessionLocal
+from models import Admin, Post, Tag
 
-    post = Post(
-        title="post title",
-        thumbnail="thumbnail.jpg",
-        description="description post ---------",
-        content="content -------------",
-        is_public=True,
-        author_id="13534c723c044e10a4a8eb342180965e"
-    )
-    db.add(post)
-    db.commit()
 
-    post = db.query(Post).filter(Post.title == "post title").first()
-    tag = db.query(Tag).filter(Tag.title == "React.js").first()
-    post.tags.append(tag)
-    db.add(post)
-    db.commit()
+async def seed():
+    async with AsyncSessionLocal() as db:
+        new_admin = Admin(email="guest@gmail.com", hashed_password="secrethashedpassword")
+        db.add(new_admin)
+        await db.commit()
+
+        new_tag = Tag(title="Python", slug="python")
+        db.add(new_tag)
+        new_tag = Tag(title="React.js", slug="reactjs")
+        db.add(new_tag)
+        await db.commit()
+
+        post = Post(
+            title="post title",
+            thumbnail="thumbnail.jpg",
+            description="description post ---------",
+            content="content -------------",
+            is_public=True,
+            author_id="13534c723c044e10a4a8eb342180965e"
+        )
+        db.add(post)
+        await db.commit()
+
+        result = await db.execute(
+            select(Post).options(selectinload(Post.tags)).where(Post.title == "post title")
+        )
+        post = result.scalars().first()
+        result = await db.execute(select(Tag).where(Tag.title == "React.js"))
+        tag = result.scalars().first()
+        post.tags.append(tag)
+        db.add(post)
+        await db.commit()
 
 
 if __name__ == "__main__":
@@ -38,4 +46,4 @@ if __name__ == "__main__":
     EOS = '\033[0m'
 
     print(f"{BOS}Seeding data...{EOS}")
-    seed()
+    asyncio.run(seed())